@@ -1,29 +1,50 @@
 #!/usr/bin/env python3
 
+import logging
+import multiprocessing
 import os
-# Disable hardware acceleration to prevent GL context issues
-os.environ['GDK_RENDERING'] = 'cairo'
-os.environ['GSK_RENDERER'] = 'cairo'
-os.environ['GDK_GL'] = '0'
-os.environ['GSK_DEBUG'] = 'cairo'
+import sys
+import threading
 
 import gi
 gi.require_version('Gtk', '4.0')
 from gi.repository import Gtk
 
-from label_editor.ui.main_window import LabelEditorWindow
-
 
 class LabelEditorApp(Gtk.Application):
     def __init__(self):
         super().__init__(application_id="com.example.labeleditor")
 
     def do_activate(self):
+        # The UI stack is imported here so it stays off the startup path
+        # until GTK actually asks for a window
+        from label_editor.ui.main_window import LabelEditorWindow
+        from label_editor.business.label_logic import preload_ocr_dependencies
+
+        # Import OCR libraries in the background while the window comes up
+        threading.Thread(target=preload_ocr_dependencies, daemon=True).start()
+
         window = LabelEditorWindow(self)
         window.present()
 
 
 def main():
+    # OCR worker processes re-run this module when frozen into an executable
+    multiprocessing.freeze_support()
+
+    # OCR diagnostics go through the logging module; LOGLEVEL=DEBUG shows them.
+    # An unknown level name falls back to WARNING rather than failing startup
+    level = logging.getLevelName(os.environ.get('LOGLEVEL', 'WARNING').upper())
+    logging.basicConfig(
+        level=level if isinstance(level, int) else logging.WARNING,
+        format='%(levelname)s %(name)s: %(message)s',
+    )
+
+    # GTK picks the GPU renderer by default; --safe-renderer (or --no-gl)
+    # falls back to Cairo for drivers that fail to create a GL context
+    if '--safe-renderer' in sys.argv or '--no-gl' in sys.argv:
+        os.environ.setdefault('GSK_RENDERER', 'cairo')
+
     app = LabelEditorApp()
     app.run()
 
@@ -9,13 +9,15 @@ import sys
 import shutil
 import subprocess
 import platform
+import tarfile
+import zipfile
 from pathlib import Path
 
 def run_command(cmd, cwd=None):
-    """Run a command and return success status"""
-    print(f"Running: {cmd}")
+    """Run a command (list of arguments) and return success status"""
+    print(f"Running: {' '.join(cmd)}")
     try:
-        result = subprocess.run(cmd, shell=True, cwd=cwd, check=True, 
+        result = subprocess.run(cmd, shell=False, cwd=cwd, check=True, 
                               capture_output=True, text=True)
         print(result.stdout)
         return True
@@ -24,6 +26,10 @@ def run_command(cmd, cwd=None):
         print(f"stdout: {e.stdout}")
         print(f"stderr: {e.stderr}")
         return False
+    except OSError as e:
+        # Without a shell, a missing executable raises instead of exiting 127
+        print(f"Error: {e}")
+        return False
 
 def install_system_dependencies():
     """Install system dependencies based on platform"""
@@ -32,8 +38,10 @@ def install_system_dependencies():
     if system == 'linux':
         print("Installing Linux dependencies...")
         commands = [
-            "sudo apt-get update",
-            "sudo apt-get install -y libgirepository1.0-dev libcairo2-dev libpango1.0-dev libgdk-pixbuf2.0-dev libgtk-4-dev gobject-introspection tesseract-ocr tesseract-ocr-eng"
+            ["sudo", "apt-get", "update"],
+            ["sudo", "apt-get", "install", "-y", "libgirepository1.0-dev", "libcairo2-dev",
+             "libpango1.0-dev", "libgdk-pixbuf2.0-dev", "libgtk-4-dev", "gobject-introspection",
+             "tesseract-ocr", "tesseract-ocr-eng"]
         ]
         for cmd in commands:
             if not run_command(cmd):
@@ -43,7 +51,7 @@ def install_system_dependencies():
     elif system == 'darwin':
         print("Installing macOS dependencies...")
         commands = [
-            "brew install gtk4 gobject-introspection cairo pango gdk-pixbuf tesseract"
+            ["brew", "install", "gtk4", "gobject-introspection", "cairo", "pango", "gdk-pixbuf", "tesseract"]
         ]
         for cmd in commands:
             if not run_command(cmd):
@@ -53,8 +61,7 @@ def install_system_dependencies():
     elif system == 'windows':
         print("Installing Windows dependencies...")
         commands = [
-            "choco install gtk-runtime -y",
-            "choco install tesseract -y"
+            ["choco", "install", "gtk-runtime", "tesseract", "-y"]
         ]
         for cmd in commands:
             if not run_command(cmd):
@@ -68,25 +75,33 @@ def build_application():
     print("Building application...")
     
     # Clean previous builds
-    if os.path.exists('dist'):
-        shutil.rmtree('dist')
-    if os.path.exists('build'):
-        shutil.rmtree('build')
+    shutil.rmtree('dist', ignore_errors=True)
+    shutil.rmtree('build', ignore_errors=True)
     
     # Install Python dependencies
-    if not run_command("python -m pip install --upgrade pip"):
+    if not run_command(["python", "-m", "pip", "install", "--upgrade", "pip"]):
         return False
     
-    if not run_command("pip install -r requirements.txt"):
+    if not run_command(["pip", "install", "-r", "requirements.txt"]):
         return False
     
     # Build with PyInstaller
-    if not run_command("pyinstaller --clean --noconfirm build.spec"):
+    if not run_command(["pyinstaller", "--clean", "--noconfirm", "build.spec"]):
         return False
     
     print("Build completed successfully!")
     return True
 
+def iter_files(root, prefix=''):
+    """Yield (path, archive name) for every file under root using os.scandir"""
+    with os.scandir(root) as it:
+        for entry in it:
+            name = prefix + entry.name
+            if entry.is_dir(follow_symlinks=False):
+                yield from iter_files(entry.path, name + '/')
+            else:
+                yield entry.path, name
+
 def create_distribution():
     """Create distribution archives"""
     system = platform.system().lower()
@@ -103,19 +118,17 @@ def create_distribution():
     if system == 'windows':
         # Create ZIP for Windows
         archive_name = f"{app_name}-{system}-{platform.machine()}.zip"
-        shutil.make_archive(
-            f'releases/{archive_name[:-4]}', 
-            'zip', 
-            'dist'
-        )
+        # PyInstaller output is mostly compiled binaries; fast compression
+        # gives nearly the same size in a fraction of the time
+        with zipfile.ZipFile(f'releases/{archive_name}', 'w',
+                             compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zf:
+            for path, name in iter_files('dist'):
+                zf.write(path, name)
     else:
         # Create tar.gz for Linux/macOS
         archive_name = f"{app_name}-{system}-{platform.machine()}.tar.gz"
-        shutil.make_archive(
-            f'releases/{archive_name[:-7]}', 
-            'gztar', 
-            'dist'
-        )
+        with tarfile.open(f'releases/{archive_name}', 'w:gz', compresslevel=1) as tf:
+            tf.add('dist', arcname='.')
     
     print(f"Created distribution: releases/{archive_name}")
     return True
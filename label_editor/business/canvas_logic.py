@@ -4,11 +4,26 @@ from typing import Tuple, List, Optional, Dict, Any
 from ..core.data_types import BoundingBox
 
 
+# Resize handle -> multipliers applied to the image-space drag delta for
+# (x, y, width, height)
+_HANDLE_DELTAS = {
+    "nw": (1, 1, -1, -1),
+    "ne": (0, 1, 1, -1),
+    "sw": (1, 0, -1, 1),
+    "se": (0, 0, 1, 1),
+    "n": (0, 1, 0, -1),
+    "s": (0, 0, 0, 1),
+    "w": (1, 0, -1, 0),
+    "e": (0, 0, 1, 0),
+}
+
+
 class CanvasState:
     """Manages canvas state including zoom, pan, and scale operations"""
     
     def __init__(self):
         self.scale_factor = 1.0
+        self._inv_scale = 1.0  # 1 / scale_factor, kept in sync on every scale change
         self.base_scale_factor = 1.0  # For fit-to-window
         self.zoom_level = 1.0  # User zoom multiplier
         self.offset_x = 0
@@ -65,6 +80,7 @@ class CanvasState:
         self.base_scale_factor = min(scale_x, scale_y, 1.0)  # Don't scale up
         
         self.scale_factor = self.base_scale_factor * self.zoom_level
+        self._inv_scale = 1.0 / self.scale_factor if self.scale_factor else 0.0
         
         # Center the image
         scaled_width = self.image_width * self.scale_factor
@@ -93,6 +109,7 @@ class CanvasState:
         """Update scale factor after zoom change"""
         old_scale = self.scale_factor
         self.scale_factor = self.base_scale_factor * self.zoom_level
+        self._inv_scale = 1.0 / self.scale_factor if self.scale_factor else 0.0
         
         # Adjust offsets to maintain center point
         if old_scale > 0:
@@ -107,6 +124,11 @@ class CanvasState:
         
         self._notify_state_changed()
     
+    @property
+    def inverse_scale(self) -> float:
+        """Image pixels per canvas pixel (1 / scale_factor)"""
+        return self._inv_scale
+    
     def image_to_canvas(self, x: int, y: int) -> Tuple[int, int]:
         """Convert image coordinates to canvas coordinates"""
         canvas_x = x * self.scale_factor + self.offset_x
@@ -115,8 +137,8 @@ class CanvasState:
     
     def canvas_to_image(self, x: int, y: int) -> Tuple[int, int]:
         """Convert canvas coordinates to image coordinates"""
-        img_x = (x - self.offset_x) / self.scale_factor
-        img_y = (y - self.offset_y) / self.scale_factor
+        img_x = (x - self.offset_x) * self._inv_scale
+        img_y = (y - self.offset_y) * self._inv_scale
         return int(img_x), int(img_y)
     
     def start_pan(self, x: int, y: int):
@@ -192,13 +214,39 @@ class BoxInteractionManager:
         self.canvas_state = canvas_state
         self.boxes = []
         self.selected_box = None
+        self._selected_idx = -1
         self.on_box_selected = None
         self.on_boxes_changed = None
+        
+        # Class lookup table, rebuilt when a different class_config is passed in
+        self._class_config = None
+        self._class_by_id = {}
+        self._class_ids = ()
+    
+    def _index_classes(self, class_config: Dict[str, Any]):
+        """Build the class id lookup table for class_config if it changed"""
+        if class_config is self._class_config:
+            return
+        self._class_config = class_config
+        self._class_ids = tuple(cls["id"] for cls in class_config["classes"])
+        self._class_by_id = {}
+        for cls in class_config["classes"]:
+            self._class_by_id.setdefault(cls["id"], cls)
     
     def set_boxes(self, boxes: List[BoundingBox]):
         """Set the list of boxes"""
         self.boxes = boxes
         self.selected_box = None
+        self._selected_idx = -1
+    
+    def _selected_index(self) -> int:
+        """Index of the selected box, re-validated since the list is shared"""
+        idx = self._selected_idx
+        if 0 <= idx < len(self.boxes) and self.boxes[idx] is self.selected_box:
+            return idx
+        idx = next((i for i, b in enumerate(self.boxes) if b is self.selected_box), -1)
+        self._selected_idx = idx
+        return idx
     
     def find_box_at_point(self, canvas_x: int, canvas_y: int) -> Optional[BoundingBox]:
         """Find box at canvas coordinates"""
@@ -232,6 +280,7 @@ class BoxInteractionManager:
             self.selected_box = box
         else:
             self.selected_box = None
+            self._selected_idx = -1
         
         if self.on_box_selected:
             self.on_box_selected(box)
@@ -239,8 +288,9 @@ class BoxInteractionManager:
     def delete_selected_box(self):
         """Delete the currently selected box"""
         if self.selected_box:
-            self.boxes.remove(self.selected_box)
-            self.selected_box = None
+            idx = self._selected_index()
+            if idx >= 0:
+                del self.boxes[idx]
             self.select_box(None)
             self._notify_boxes_changed()
     
@@ -258,34 +308,30 @@ class BoxInteractionManager:
         box_width = abs(end_img_x - start_img_x)
         box_height = abs(end_img_y - start_img_y)
         
-        # Find appropriate class ID
-        available_classes = [cls["id"] for cls in class_config["classes"]]
-        used_classes = [b.class_id for b in self.boxes]
-        
-        class_id = available_classes[0]  # Default to first class
-        for cls_id in available_classes:
-            if cls_id not in used_classes:
-                class_id = cls_id
-                break
+        # Find appropriate class ID: first unused class, else the first class
+        self._index_classes(class_config)
+        if self.boxes:
+            used_classes = {b.class_id for b in self.boxes}
+            class_id = next((c for c in self._class_ids if c not in used_classes), self._class_ids[0])
+        else:
+            class_id = self._class_ids[0]
         
         # Get class name
-        class_name = "unknown"
-        for cls in class_config["classes"]:
-            if cls["id"] == class_id:
-                class_name = cls["name"]
-                break
+        cls = self._class_by_id.get(class_id)
+        class_name = cls["name"] if cls else "unknown"
         
         new_box = BoundingBox(box_x, box_y, box_width, box_height, class_id, "", class_name)
         self.boxes.append(new_box)
         self.select_box(new_box)
+        self._selected_idx = len(self.boxes) - 1
         self._notify_boxes_changed()
         
         return new_box
     
     def update_box_position(self, box: BoundingBox, canvas_dx: int, canvas_dy: int):
         """Update box position from canvas drag"""
-        img_dx = canvas_dx / self.canvas_state.scale_factor
-        img_dy = canvas_dy / self.canvas_state.scale_factor
+        img_dx = canvas_dx * self.canvas_state.inverse_scale
+        img_dy = canvas_dy * self.canvas_state.inverse_scale
         
         box.x = max(0, self.canvas_state.box_start_x + img_dx)
         box.y = max(0, self.canvas_state.box_start_y + img_dy)
@@ -293,35 +339,16 @@ class BoxInteractionManager:
     
     def update_box_size(self, box: BoundingBox, canvas_dx: int, canvas_dy: int, handle: str):
         """Update box size from canvas resize"""
-        img_dx = canvas_dx / self.canvas_state.scale_factor
-        img_dy = canvas_dy / self.canvas_state.scale_factor
+        img_dx = canvas_dx * self.canvas_state.inverse_scale
+        img_dy = canvas_dy * self.canvas_state.inverse_scale
         
-        if handle == "nw":
-            box.x = self.canvas_state.box_start_x + img_dx
-            box.y = self.canvas_state.box_start_y + img_dy
-            box.width = self.canvas_state.box_start_width - img_dx
-            box.height = self.canvas_state.box_start_height - img_dy
-        elif handle == "ne":
-            box.y = self.canvas_state.box_start_y + img_dy
-            box.width = self.canvas_state.box_start_width + img_dx
-            box.height = self.canvas_state.box_start_height - img_dy
-        elif handle == "sw":
-            box.x = self.canvas_state.box_start_x + img_dx
-            box.width = self.canvas_state.box_start_width - img_dx
-            box.height = self.canvas_state.box_start_height + img_dy
-        elif handle == "se":
-            box.width = self.canvas_state.box_start_width + img_dx
-            box.height = self.canvas_state.box_start_height + img_dy
-        elif handle == "n":
-            box.y = self.canvas_state.box_start_y + img_dy
-            box.height = self.canvas_state.box_start_height - img_dy
-        elif handle == "s":
-            box.height = self.canvas_state.box_start_height + img_dy
-        elif handle == "w":
-            box.x = self.canvas_state.box_start_x + img_dx
-            box.width = self.canvas_state.box_start_width - img_dx
-        elif handle == "e":
-            box.width = self.canvas_state.box_start_width + img_dx
+        deltas = _HANDLE_DELTAS.get(handle)
+        if deltas:
+            sx, sy, sw, sh = deltas
+            box.x = self.canvas_state.box_start_x + sx * img_dx
+            box.y = self.canvas_state.box_start_y + sy * img_dy
+            box.width = self.canvas_state.box_start_width + sw * img_dx
+            box.height = self.canvas_state.box_start_height + sh * img_dy
         
         # Ensure minimum size
         if box.width < 10:
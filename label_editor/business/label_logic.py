@@ -1,23 +1,416 @@
 #!/usr/bin/env python3
 
+import atexit
+import functools
+import logging
+import multiprocessing
+import os
+import queue
+import shlex
 import threading
 import time
 import sqlite3
 import json
+import weakref
+from operator import attrgetter
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Callable
+from collections import Counter, namedtuple, OrderedDict
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from ..core.data_types import BoundingBox
 from ..core.file_io import DATParser
 from ..core.image_ops import ImageOperations
 
+log = logging.getLogger(__name__)
+
+
+def _noop(*args, **kwargs):
+    """Default for unset callbacks, so callers need no None check"""
+
+
+# Frozen view of one class_config["classes"] entry used by the hot lookups
+ClassEntry = namedtuple("ClassEntry", "id name key")
+
+# Database files already switched to WAL (the journal mode persists in the file)
+_wal_databases = set()
+_wal_lock = threading.Lock()
+
+
+def _connect_db(db_path) -> sqlite3.Connection:
+    """Open a SQLite connection tuned for small, frequent writes from the UI
+    
+    WAL lets readers proceed while another thread writes, and with
+    synchronous=NORMAL a commit no longer waits for an fsync. Reads go
+    through a memory map of up to 64 MB.
+    """
+    db_path = str(db_path)
+    conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=128)
+    with _wal_lock:
+        if db_path not in _wal_databases:
+            conn.execute("PRAGMA journal_mode=WAL")
+            _wal_databases.add(db_path)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    conn.execute("PRAGMA cache_size=-8000")
+    conn.execute("PRAGMA mmap_size=67108864")
+    return conn
+
+
+def _close_db(conn: sqlite3.Connection):
+    """Fold the WAL back into the database file and close the connection"""
+    try:
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    except sqlite3.Error as e:
+        log.warning("WAL checkpoint failed: %s", e)
+    conn.close()
+
+
+# DELETE ... RETURNING needs SQLite 3.35
+_SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Stay under SQLite's default limit on bound parameters per statement
+_SQL_MAX_PARAMS = 900
+
+
+def _delete_where_in(conn: sqlite3.Connection, table: str, column: str, values) -> None:
+    """Delete rows whose column matches any of values, a few statements at most"""
+    values = list(values)
+    for start in range(0, len(values), _SQL_MAX_PARAMS):
+        chunk = values[start:start + _SQL_MAX_PARAMS]
+        placeholders = ",".join("?" * len(chunk))
+        conn.execute(f"DELETE FROM {table} WHERE {column} IN ({placeholders})", chunk)
+
+
+def _in_class_order(boxes: List[BoundingBox]) -> bool:
+    """Whether boxes are already ordered by class_id"""
+    return all(a.class_id <= b.class_id for a, b in zip(boxes, boxes[1:]))
+
+
+# Image types tracked by the history and confirmation databases
+_IMAGE_SUFFIXES = ('.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif')
+
+# (directory, mtime_ns, files) of the last listing, shared by both directory syncs
+_last_image_listing = (None, None, frozenset())
+_last_image_listing_lock = threading.Lock()
+
+
+def _list_image_files(directory_path) -> frozenset:
+    """Paths of the image files in a directory, reused while the directory is unchanged"""
+    global _last_image_listing
+    directory = str(Path(directory_path))
+    # UI and OCR threads both list directories; the lock keeps the mtime
+    # check and the listing it stores paired to the same directory
+    with _last_image_listing_lock:
+        mtime_ns = os.stat(directory).st_mtime_ns
+        cached_dir, cached_mtime, cached_files = _last_image_listing
+        if cached_dir == directory and cached_mtime == mtime_ns:
+            return cached_files
+        
+        with os.scandir(directory) as entries:
+            files = frozenset(entry.path for entry in entries
+                              if entry.name.lower().endswith(_IMAGE_SUFFIXES)
+                              and entry.is_file())
+        _last_image_listing = (directory, mtime_ns, files)
+        return files
+
+
+# Per-thread connections shared by every manager, kept open for the most
+# recently used database files (two per image directory)
+_CONNECTION_CACHE_SIZE = 6
+_thread_connections = threading.local()
+
+
+def _get_connection(db_path) -> sqlite3.Connection:
+    """Return this thread's cached connection to db_path, opening it on first use"""
+    cache = getattr(_thread_connections, "cache", None)
+    if cache is None:
+        cache = _thread_connections.cache = OrderedDict()
+    
+    key = str(db_path)
+    conn = cache.get(key)
+    if conn is not None:
+        cache.move_to_end(key)
+        return conn
+    
+    conn = cache[key] = _connect_db(key)
+    while len(cache) > _CONNECTION_CACHE_SIZE:
+        _close_db(cache.popitem(last=False)[1])
+    return conn
+
+
+def _close_connection(db_path):
+    """Close this thread's cached connection to db_path, if it has one"""
+    cache = getattr(_thread_connections, "cache", None)
+    if cache is None or db_path is None:
+        return
+    conn = cache.pop(str(db_path), None)
+    if conn is not None:
+        _close_db(conn)
+
+
+# Writers with a running thread. The thread is a daemon so it can't keep
+# the app alive, so rows put() has already accepted are committed here at
+# interpreter exit for owners that never called close()
+_live_writers = weakref.WeakSet()
+
+
+@atexit.register
+def _close_live_writers():
+    for writer in list(_live_writers):
+        writer.close()
+
+
+class _GroupCommitWriter:
+    """Commits rows for one INSERT statement on a background thread
+    
+    Rows queued within `window` seconds of each other are written with
+    one executemany per database file, so a burst of edits costs a
+    single WAL commit instead of one per row.
+    """
+    
+    _MAX_BATCH = 100
+    
+    def __init__(self, sql: str, window: float, name: str):
+        self.sql = sql
+        self.window = window
+        self.name = name
+        self._rows = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def put(self, db_path, row: tuple):
+        """Queue a row for db_path and return without waiting for the commit"""
+        self._ensure_started()
+        self._rows.put((db_path, row))
+    
+    def flush(self):
+        """Block until every queued row is committed"""
+        self._rows.join()
+    
+    def close(self):
+        """Commit queued rows and stop the thread"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                _live_writers.discard(self)
+                self._rows.put(None)
+                # A finalizer can run on the writer thread itself
+                if thread is not threading.current_thread():
+                    thread.join()
+    
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                    self._thread.start()
+                    _live_writers.add(self)
+    
+    def _run(self):
+        db_paths = set()
+        stop = False
+        while not stop:
+            items = [self._rows.get()]
+            deadline = time.monotonic() + self.window
+            while items[-1] is not None and len(items) < self._MAX_BATCH:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    items.append(self._rows.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            rows_by_db = {}
+            for item in items:
+                if item is None:
+                    stop = True
+                else:
+                    rows_by_db.setdefault(item[0], []).append(item[1])
+            
+            for db_path, rows in rows_by_db.items():
+                db_paths.add(db_path)
+                try:
+                    with _get_connection(db_path) as conn:
+                        conn.executemany(self.sql, rows)
+                except Exception as e:
+                    log.error("Error writing %s rows: %s", self.name, e)
+            
+            for _ in items:
+                self._rows.task_done()
+        
+        for db_path in db_paths:
+            _close_connection(db_path)
+
+
+class _LazyOCR:
+    """Imports the heavy OCR dependencies once and shares them across threads"""
+    
+    _instance = None
+    _error = None
+    _lock = threading.Lock()
+    
+    def __init__(self):
+        import pytesseract
+        from PIL import Image
+        import cv2
+        import numpy as np
+        self.pytesseract = pytesseract
+        self.Image = Image
+        self.cv2 = cv2
+        self.np = np
+    
+    @classmethod
+    def get(cls) -> "_LazyOCR":
+        """Return the loaded modules, importing them on first use
+        
+        A failed import is remembered, so later OCR requests report it
+        without searching sys.path for the missing package again.
+        """
+        if cls._instance is None:
+            with cls._lock:
+                if cls._error is not None:
+                    raise cls._error.with_traceback(None)
+                if cls._instance is None:
+                    try:
+                        cls._instance = cls()
+                    except ImportError as e:
+                        cls._error = e
+                        raise
+        return cls._instance
+
+
+def preload_ocr_dependencies():
+    """Warm the OCR imports so the first OCR request does not pay for them"""
+    try:
+        _LazyOCR.get()
+    except ImportError:
+        pass  # Reported when the user actually runs OCR
+
+
+class TesseractWorker:
+    """Runs Tesseract on one long-lived thread so models stay loaded between boxes
+    
+    With the tesserocr binding installed, one PyTessBaseAPI is kept per config
+    string and the traineddata is loaded once per session. Without it, calls
+    fall back to pytesseract, which starts a tesseract process per image.
+    """
+    
+    def __init__(self, lang: str = "eng"):
+        self.lang = lang
+        self._jobs = queue.Queue()
+        self._apis = {}
+        self._thread = None
+        self._start_lock = threading.Lock()
+    
+    def recognize(self, pil_image, config: str = "") -> str:
+        """Run OCR on a PIL image and block until the text is available"""
+        self._ensure_started()
+        reply = queue.Queue(maxsize=1)
+        self._jobs.put((pil_image, config, reply))
+        ok, result = reply.get()
+        if not ok:
+            raise result
+        return result
+    
+    def close(self):
+        """Stop the worker thread and release loaded models"""
+        with self._start_lock:
+            if self._thread is not None:
+                self._jobs.put(None)
+                self._thread = None
+    
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, daemon=True)
+                    self._thread.start()
+    
+    def _run(self):
+        try:
+            import tesserocr
+        except ImportError:
+            tesserocr = None
+        
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            pil_image, config, reply = job
+            try:
+                if tesserocr is None:
+                    text = _LazyOCR.get().pytesseract.image_to_string(pil_image, config=config)
+                else:
+                    api = self._apis.get(config)
+                    if api is None:
+                        api = self._apis[config] = self._create_api(tesserocr, config)
+                    api.SetImage(pil_image)
+                    text = api.GetUTF8Text()
+                reply.put((True, text))
+            except Exception as e:
+                reply.put((False, e))
+        
+        for api in self._apis.values():
+            api.End()
+        self._apis.clear()
+    
+    def _create_api(self, tesserocr, config: str):
+        """Translate a tesseract command-line config into a PyTessBaseAPI"""
+        options = {"lang": self.lang, "variables": {}}
+        args = shlex.split(config)
+        i = 0
+        while i < len(args):
+            arg = args[i]
+            value = args[i + 1] if i + 1 < len(args) else ""
+            if arg == "--oem":
+                options["oem"] = int(value)
+                i += 2
+            elif arg == "--psm":
+                options["psm"] = int(value)
+                i += 2
+            elif arg == "-l":
+                options["lang"] = value
+                i += 2
+            elif arg == "-c" and "=" in value:
+                key, val = value.split("=", 1)
+                options["variables"][key] = val
+                i += 2
+            else:
+                i += 1
+        return tesserocr.PyTessBaseAPI(**options)
+
 
 class LabelManager:
     """Manages label operations including OCR, creation, editing, and deletion"""
     
+    # Deletion history statements, kept as constants so the connection's
+    # statement cache reuses the compiled form. The history is a ring of
+    # max_history_size slots per image: entry number seq lives in slot
+    # seq % max_history_size, so recording a deletion overwrites the oldest
+    # entry instead of inserting and pruning.
+    _SQL_SAVE_DELETED = (
+        "INSERT OR REPLACE INTO deletion_history "
+        "(image_path, slot, seq, x1, y1, x2, y2, class_id, ocr_text) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)")
+    _SQL_LAST_SEQ = "SELECT MAX(seq) FROM deletion_history WHERE image_path = ?"
+    _SQL_LAST_DELETED = (
+        "SELECT x1, y1, x2, y2, class_id, ocr_text, seq FROM deletion_history "
+        "WHERE image_path = ? ORDER BY seq DESC LIMIT 1")
+    _SQL_DELETE_HISTORY_SEQ = "DELETE FROM deletion_history WHERE image_path = ? AND seq = ?"
+    _SQL_POP_LAST_DELETED = (
+        "DELETE FROM deletion_history WHERE image_path = ? AND seq = ("
+        "SELECT MAX(seq) FROM deletion_history WHERE image_path = ?) "
+        "RETURNING x1, y1, x2, y2, class_id, ocr_text, seq")
+    
+    # Deletions arriving within this many seconds share one transaction
+    _GROUP_COMMIT_WINDOW = 0.05
+    
     def __init__(self, class_config: Dict[str, Any]):
         self.class_config = class_config
         self.boxes = []
         self.selected_box = None
+        self._selected_idx = -1
         self.unsaved_changes = False
         self.last_save_time = {}
         self.confirmation_status = {}
@@ -25,17 +418,56 @@ class LabelManager:
         # Deletion history database
         self.db_path = None
         self.max_history_size = 20
+        self._next_seq = {}  # image_path -> seq of its next history entry
         
-        # Callbacks
-        self.on_box_selected = None
-        self.on_boxes_changed = None
-        self.on_status_update = None
-        self.on_error = None
+        # Deleted boxes are committed in bursts by a background thread
+        self._writer = _GroupCommitWriter(self._SQL_SAVE_DELETED, self._GROUP_COMMIT_WINDOW,
+                                          "deletion-history")
+        
+        # Callbacks; assign a callable to listen
+        self.on_box_selected = _noop
+        self.on_boxes_changed = _noop
+        self.on_status_update = _noop
+        self.on_error = _noop
+        
+        self.reload_config()
+    
+    def reload_config(self, class_config: Optional[Dict[str, Any]] = None):
+        """Rebuild class lookup tables after the class configuration changes"""
+        if class_config is not None:
+            self.class_config = class_config
+        
+        classes = self.class_config["classes"]
+        self._classes = tuple(ClassEntry(cls["id"], cls["name"], cls.get("key")) for cls in classes)
+        self._class_ids = tuple(entry.id for entry in self._classes)
+        
+        self._class_by_id = {}
+        self._entry_by_id = {}
+        self._entry_by_keyval = {}
+        for cls, entry in zip(classes, self._classes):
+            self._class_by_id.setdefault(entry.id, cls)
+            self._entry_by_id.setdefault(entry.id, entry)
+            keyval = getattr(self, f'KEY_{entry.key}', None)
+            if keyval is not None:
+                self._entry_by_keyval.setdefault(keyval, entry)
         
     def set_boxes(self, boxes: List[BoundingBox]):
         """Set the current list of boxes"""
         self.boxes = boxes
     
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection to the deletion history database"""
+        return _get_connection(self.db_path)
+    
+    def close(self):
+        """Write pending deletions and close the history connections, e.g. when the window closes"""
+        self._writer.close()
+        _close_connection(self.db_path)
+    
+    def flush(self):
+        """Block until every deletion queued by save_deleted_box is committed"""
+        self._writer.flush()
+    
     def init_deletion_history_db(self, directory_path: str):
         """Initialize deletion history database for current directory"""
         if not directory_path:
@@ -44,31 +476,59 @@ class LabelManager:
         try:
             # Create database in the same directory as the images
             db_dir = Path(directory_path)
+            self.flush()
             self.db_path = db_dir / "deletion_history.db"
             
-            conn = sqlite3.connect(str(self.db_path))
+            self._next_seq = {}
+            
+            conn = self._connect()
             cursor = conn.cursor()
             
+            # Histories written before the ring layout have an id column
+            columns = {row[1] for row in cursor.execute('PRAGMA table_info(deletion_history)')}
+            legacy = bool(columns) and "slot" not in columns
+            if legacy:
+                cursor.execute('ALTER TABLE deletion_history RENAME TO deletion_history_legacy')
+            
             # Create table if it doesn't exist
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS deletion_history (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
                     image_path TEXT NOT NULL,
+                    slot INTEGER NOT NULL,
+                    seq INTEGER NOT NULL,
                     deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     x1 INTEGER NOT NULL,
                     y1 INTEGER NOT NULL,
                     x2 INTEGER NOT NULL,
                     y2 INTEGER NOT NULL,
                     class_id INTEGER NOT NULL,
-                    ocr_text TEXT
+                    ocr_text TEXT,
+                    PRIMARY KEY (image_path, slot)
                 )
             ''')
             
+            # Newest-first lookups per image for restore
+            cursor.execute('''
+                CREATE INDEX IF NOT EXISTS idx_del_img_seq
+                ON deletion_history(image_path, seq)
+            ''')
+            
+            if legacy:
+                # Keep the newest entries of each image, numbered oldest first
+                cursor.execute('''
+                    INSERT OR REPLACE INTO deletion_history
+                    (image_path, slot, seq, deleted_at, x1, y1, x2, y2, class_id, ocr_text)
+                    SELECT image_path, (rn - 1) % ?, rn - 1, deleted_at, x1, y1, x2, y2, class_id, ocr_text
+                    FROM (SELECT *, ROW_NUMBER() OVER (PARTITION BY image_path ORDER BY id) AS rn
+                          FROM deletion_history_legacy)
+                    ORDER BY rn
+                ''', (self.max_history_size,))
+                cursor.execute('DROP TABLE deletion_history_legacy')
+            
             conn.commit()
-            conn.close()
             
         except Exception as e:
-            print(f"Error initializing deletion history database: {e}")
+            log.error("Error initializing deletion history database: %s", e)
             self.db_path = None
     
     def sync_deletion_history_with_directory(self, directory_path: str):
@@ -77,36 +537,31 @@ class LabelManager:
             return
         
         try:
-            from pathlib import Path
-            
             # Get all image files in directory
-            directory = Path(directory_path)
-            image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif'}
-            current_files = set()
-            
-            for file_path in directory.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                    current_files.add(str(file_path))
-            
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            # Get all image paths in database
-            cursor.execute('SELECT DISTINCT image_path FROM deletion_history')
-            db_files = set(row[0] for row in cursor.fetchall())
-            
-            # Remove entries for files that no longer exist
-            removed_files = db_files - current_files
-            if removed_files:
-                for file_path in removed_files:
-                    cursor.execute('DELETE FROM deletion_history WHERE image_path = ?', (file_path,))
-                print(f"Removed {len(removed_files)} deleted file entries from deletion history")
-            
-            conn.commit()
-            conn.close()
+            current_files = _list_image_files(directory_path)
+            
+            self.flush()
+            conn = self._connect()
+            
+            # Remove entries for files that no longer exist, as one set
+            # difference against a temporary table of the current files
+            with conn:
+                conn.execute('CREATE TEMP TABLE IF NOT EXISTS current_images (path TEXT PRIMARY KEY)')
+                conn.execute('DELETE FROM current_images')
+                conn.executemany('INSERT INTO current_images (path) VALUES (?)',
+                                 ((path,) for path in current_files))
+                removed = conn.execute(
+                    'DELETE FROM deletion_history '
+                    'WHERE image_path NOT IN (SELECT path FROM current_images)').rowcount
+                conn.execute('DELETE FROM current_images')
+            
+            if removed:
+                # Sequence numbers are re-read from the table on next use
+                self._next_seq = {}
+                log.info("Removed %s deletion history entries of missing files", removed)
             
         except Exception as e:
-            print(f"Error syncing deletion history with directory: {e}")
+            log.error("Error syncing deletion history with directory: %s", e)
     
     def save_deleted_box(self, image_path: str, box: BoundingBox):
         """Save deleted box to history database"""
@@ -114,32 +569,21 @@ class LabelManager:
             return
         
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            # Insert deleted box
-            cursor.execute('''
-                INSERT INTO deletion_history 
-                (image_path, x1, y1, x2, y2, class_id, ocr_text)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (image_path, box.x1, box.y1, box.x2, box.y2, box.class_id, box.ocr_text))
-            
-            # Keep only last 20 deletions per image
-            cursor.execute('''
-                DELETE FROM deletion_history 
-                WHERE image_path = ? AND id NOT IN (
-                    SELECT id FROM deletion_history 
-                    WHERE image_path = ? 
-                    ORDER BY deleted_at DESC 
-                    LIMIT ?
-                )
-            ''', (image_path, image_path, self.max_history_size))
-            
-            conn.commit()
-            conn.close()
+            seq = self._next_seq.get(image_path)
+            if seq is None:
+                self.flush()
+                last_seq = self._connect().execute(self._SQL_LAST_SEQ, (image_path,)).fetchone()[0]
+                seq = 0 if last_seq is None else last_seq + 1
+            
+            # Overwrite the oldest slot, so only the last 20 deletions per image
+            # are kept. The writer thread commits a burst of deletions at once.
+            self._writer.put(self.db_path,
+                             (image_path, seq % self.max_history_size, seq,
+                              box.x, box.y, box.width, box.height, box.class_id, box.ocr_text))
+            self._next_seq[image_path] = seq + 1
             
         except Exception as e:
-            print(f"Error saving deleted box: {e}")
+            log.error("Error saving deleted box: %s", e)
     
     def restore_last_deleted_box(self, image_path: str) -> Optional[BoundingBox]:
         """Restore the last deleted box for current image"""
@@ -147,51 +591,44 @@ class LabelManager:
             return None
         
         try:
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            self.flush()
+            conn = self._connect()
+            
+            if _SQLITE_HAS_RETURNING:
+                # Take the most recent deleted box off the history in one statement
+                with conn:
+                    result = conn.execute(self._SQL_POP_LAST_DELETED, (image_path, image_path)).fetchone()
+            else:
+                # Get the most recent deleted box for this image, then remove it
+                result = conn.execute(self._SQL_LAST_DELETED, (image_path,)).fetchone()
+                if result:
+                    with conn:
+                        conn.execute(self._SQL_DELETE_HISTORY_SEQ, (image_path, result[-1]))
             
-            # Get the most recent deleted box for this image
-            cursor.execute('''
-                SELECT x1, y1, x2, y2, class_id, ocr_text, id
-                FROM deletion_history 
-                WHERE image_path = ? 
-                ORDER BY deleted_at DESC 
-                LIMIT 1
-            ''', (image_path,))
-            
-            result = cursor.fetchone()
             if result:
-                x1, y1, x2, y2, class_id, ocr_text, box_id = result
+                x1, y1, x2, y2, class_id, ocr_text, seq = result
                 
-                # Remove from history
-                cursor.execute('DELETE FROM deletion_history WHERE id = ?', (box_id,))
-                conn.commit()
+                # The next deletion reuses the freed slot
+                self._next_seq[image_path] = seq
                 
                 # Create restored box
                 restored_box = BoundingBox(x1, y1, x2, y2, class_id, ocr_text or "")
-                conn.close()
                 return restored_box
             
-            conn.close()
             return None
             
         except Exception as e:
-            print(f"Error restoring deleted box: {e}")
+            log.error("Error restoring deleted box: %s", e)
             return None
         
     def get_class_name(self, class_id: int) -> str:
         """Get class name by ID"""
-        for cls in self.class_config["classes"]:
-            if cls["id"] == class_id:
-                return cls["name"]
-        return f"class_{class_id}"
+        entry = self._entry_by_id.get(class_id)
+        return entry.name if entry else f"class_{class_id}"
     
     def get_class_by_id(self, class_id: int) -> Optional[Dict[str, Any]]:
         """Get class configuration by ID"""
-        for cls in self.class_config["classes"]:
-            if cls["id"] == class_id:
-                return cls
-        return None
+        return self._class_by_id.get(class_id)
     
     def select_box(self, box: Optional[BoundingBox]):
         """Select a box and trigger callbacks"""
@@ -203,21 +640,27 @@ class LabelManager:
             self.selected_box = box
         else:
             self.selected_box = None
+            self._selected_idx = -1
             
-        if self.on_box_selected:
-            self.on_box_selected(box)
+        self.on_box_selected(box)
+    
+    def _selected_index(self) -> int:
+        """Index of the selected box, re-validated since the list is shared"""
+        idx = self._selected_idx
+        if 0 <= idx < len(self.boxes) and self.boxes[idx] is self.selected_box:
+            return idx
+        idx = next((i for i, b in enumerate(self.boxes) if b is self.selected_box), -1)
+        self._selected_idx = idx
+        return idx
     
     def create_box(self, x: int, y: int, width: int, height: int) -> BoundingBox:
         """Create a new bounding box"""
-        # Find appropriate class ID
-        available_classes = [cls["id"] for cls in self.class_config["classes"]]
-        used_classes = [b.class_id for b in self.boxes]
-        
-        class_id = available_classes[0]  # Default to first class
-        for cls_id in available_classes:
-            if cls_id not in used_classes:
-                class_id = cls_id
-                break
+        # Find appropriate class ID: first unused class, else the first class
+        if self.boxes:
+            used_classes = {b.class_id for b in self.boxes}
+            class_id = next((c for c in self._class_ids if c not in used_classes), self._class_ids[0])
+        else:
+            class_id = self._class_ids[0]
         
         class_name = self.get_class_name(class_id)
         new_box = BoundingBox(x, y, width, height, class_id, "", class_name)
@@ -227,12 +670,11 @@ class LabelManager:
         if self.selected_box:
             self.selected_box.selected = False
         
-        self.boxes.append(new_box)
+        self._selected_idx = self._insert_sorted(new_box)
         self.selected_box = new_box
         self.mark_changed()
         
-        if self.on_box_selected:
-            self.on_box_selected(new_box)
+        self.on_box_selected(new_box)
         
         return new_box
     
@@ -243,13 +685,12 @@ class LabelManager:
             if current_image_path:
                 self.save_deleted_box(current_image_path, self.selected_box)
             
-            self.boxes.remove(self.selected_box)
-            self.selected_box = None
+            idx = self._selected_index()
+            if idx >= 0:
+                del self.boxes[idx]
+            self.select_box(None)
             self.mark_changed()
             
-            if self.on_box_selected:
-                self.on_box_selected(None)
-            
             return True
         return False
     
@@ -260,12 +701,11 @@ class LabelManager:
         
         restored_box = self.restore_last_deleted_box(current_image_path)
         if restored_box:
-            self.boxes.append(restored_box)
+            self._selected_idx = self._insert_sorted(restored_box)
             self.selected_box = restored_box
             self.mark_changed()
             
-            if self.on_box_selected:
-                self.on_box_selected(restored_box)
+            self.on_box_selected(restored_box)
             
             return True
         return False
@@ -281,6 +721,7 @@ class LabelManager:
         if self.selected_box:
             self.selected_box.class_id = class_id
             self.selected_box.name = self.get_class_name(class_id)
+            self._resort_box(self.selected_box)
             self.mark_changed()
     
     def select_next_box(self):
@@ -288,52 +729,95 @@ class LabelManager:
         if not self.boxes:
             return
         
-        current_idx = -1
-        if self.selected_box:
-            try:
-                current_idx = self.boxes.index(self.selected_box)
-            except ValueError:
-                pass
-        
+        current_idx = self._selected_index() if self.selected_box else -1
         next_idx = (current_idx + 1) % len(self.boxes)
         self.select_box(self.boxes[next_idx])
+        self._selected_idx = next_idx
     
     def set_box_class_by_key(self, keyval):
         """Set selected box class based on key press"""
         if not self.selected_box:
             return False
         
-        for cls in self.class_config["classes"]:
-            if keyval == getattr(self, f'KEY_{cls["key"]}', None):
-                self.selected_box.class_id = cls["id"]
-                self.selected_box.name = cls["name"]
-                self.mark_changed()
-                return True
-        return False
+        entry = self._entry_by_keyval.get(keyval)
+        if entry is None:
+            return False
+        
+        self.selected_box.class_id = entry.id
+        self.selected_box.name = entry.name
+        self._resort_box(self.selected_box)
+        self.mark_changed()
+        return True
+    
+    def _insert_sorted(self, box: BoundingBox) -> int:
+        """Insert a box keeping self.boxes ordered by class_id, returning its index
+        
+        self.boxes is often the canvas's own list or a freshly loaded one,
+        neither of which is guaranteed to be in class order, so an unordered
+        list is sorted once here; later inserts then take the binary search.
+        """
+        boxes = self.boxes
+        if not _in_class_order(boxes):
+            boxes.append(box)
+            boxes.sort(key=attrgetter("class_id"))
+            return boxes.index(box)
+        
+        # bisect_right by class_id; bisect's key= argument needs Python 3.10
+        class_id = box.class_id
+        lo, hi = 0, len(boxes)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if class_id < boxes[mid].class_id:
+                hi = mid
+            else:
+                lo = mid + 1
+        idx = lo
+        boxes.insert(idx, box)
+        return idx
+    
+    def _resort_box(self, box: BoundingBox):
+        """Move a box whose class changed back to its class_id position"""
+        try:
+            self.boxes.remove(box)
+        except ValueError:
+            return
+        self._insert_sorted(box)
+    
+    def _boxes_in_class_order(self) -> List[BoundingBox]:
+        """Boxes ordered by class_id, skipping the sort when already ordered
+        
+        Box lists handed over from the canvas are in drawing order, so a
+        linear check decides whether sorting is needed at all.
+        """
+        boxes = self.boxes
+        if _in_class_order(boxes):
+            return boxes
+        return sorted(boxes, key=attrgetter("class_id"))
     
     def mark_changed(self):
         """Mark labels as changed"""
         self.unsaved_changes = True
-        if self.on_boxes_changed:
-            self.on_boxes_changed()
+        self.on_boxes_changed()
     
     def get_ocr_character_counts(self) -> Dict[str, int]:
         """Get character counts for OCR text by class (deprecated - table now handled in UI)"""
-        counts = {}
+        counts_by_id = {}
+        get_count = counts_by_id.get
         for box in self.boxes:
-            class_name = self.get_class_name(box.class_id)
-            if class_name not in counts:
-                counts[class_name] = 0
-            counts[class_name] += len(box.ocr_text)
-        return counts
+            class_id = box.class_id
+            counts_by_id[class_id] = get_count(class_id, 0) + len(box.ocr_text)
+        
+        # Resolve names once per class; ids sharing a name are merged as before
+        counts = Counter()
+        get_class_name = self.get_class_name
+        for class_id, count in counts_by_id.items():
+            counts[get_class_name(class_id)] += count
+        return dict(counts)
     
     def get_dat_file_content(self) -> str:
         """Get DAT file content as string"""
-        lines = []
-        for box in sorted(self.boxes, key=lambda b: b.class_id):
-            line = f"{box.class_id} {box.x} {box.y} {box.width} {box.height} #{box.ocr_text}"
-            lines.append(line)
-        return '\n'.join(lines)
+        return "\n".join([f"{box.class_id} {box.x} {box.y} {box.width} {box.height} #{box.ocr_text}"
+                          for box in self._boxes_in_class_order()])
     
     def save_to_file(self, file_path: str) -> bool:
         """Save labels to DAT file"""
@@ -342,13 +826,11 @@ class LabelManager:
             self.unsaved_changes = False
             self.last_save_time[file_path] = time.time()
             
-            if self.on_status_update:
-                self.on_status_update(f"Saved {len(self.boxes)} labels to {Path(file_path).name}")
+            self.on_status_update(f"Saved {len(self.boxes)} labels to {Path(file_path).name}")
             
             return True
         except Exception as e:
-            if self.on_error:
-                self.on_error(f"Save error: {e}")
+            self.on_error(f"Save error: {e}")
             return False
     
     def load_from_file(self, file_path: str) -> bool:
@@ -357,203 +839,386 @@ class LabelManager:
             boxes = DATParser.parse_dat_file(file_path)
             self.set_boxes(boxes)
             
-            if self.on_status_update:
-                self.on_status_update(f"Loaded {len(boxes)} labels from {Path(file_path).name}")
+            self.on_status_update(f"Loaded {len(boxes)} labels from {Path(file_path).name}")
             
             return True
         except Exception as e:
-            if self.on_error:
-                self.on_error(f"Load error: {e}")
+            self.on_error(f"Load error: {e}")
             return False
 
 
+class OCRError(Exception):
+    """OCR failure whose message is meant to be shown to the user"""
+
+
+# OCRProcessor owned by an OCR worker process (see OCRProcessor use_processes)
+_worker_processor = None
+
+
+def _ocr_worker_init(class_config: Dict[str, Any], quantize_vietocr: bool = False):
+    """Set up an OCR worker process, importing the OCR libraries once"""
+    global _worker_processor
+    _worker_processor = OCRProcessor(class_config, quantize_vietocr=quantize_vietocr)
+    preload_ocr_dependencies()
+
+
+def _ocr_worker_run(image_path: str, box: BoundingBox, ocr_engine: str) -> str:
+    """Run OCR for one box inside a worker process"""
+    return _worker_processor.recognize_box(image_path, box, ocr_engine)
+
+
+# Result-dict keys that may hold recognized text in PaddleOCR output
+_TEXT_FIELDS = ('text', 'rec_text', 'ocr_text', 'recognized_text', 'result_text')
+_TEXT_FIELD_SET = frozenset(_TEXT_FIELDS)
+
+
 class OCRProcessor:
     """Handles OCR processing for labels"""
     
-    def __init__(self, class_config: Dict[str, Any]):
+    # One PaddleOCR model per process; loading it takes seconds and its
+    # predictor is not safe to call from several threads at once
+    _paddle_reader = None
+    _paddle_lock = threading.Lock()
+    
+    # Same for the VietOCR predictor, whose weights are loaded on construction
+    _vietocr_predictor = None
+    _vietocr_lock = threading.Lock()
+    
+    def __init__(self, class_config: Dict[str, Any], use_processes: bool = False,
+                 quantize_vietocr: bool = False):
         self.class_config = class_config
+        self.quantize_vietocr = quantize_vietocr
         self.on_ocr_complete = None
         self.on_ocr_error = None
         self.on_status_update = None
         self.easyocr_reader = None  # Will be initialized on first use
-        # Note: PaddleOCR instances are created fresh each time to avoid threading issues
+        self.tesseract_worker = TesseractWorker()
+        self._tesseract_configs = {}  # class_id -> Tesseract config string
+        
+        # Bounded pool so "OCR everything" doesn't start one thread per box.
+        # Worker processes keep OCR from competing with the GTK main loop
+        # for the GIL, at the cost of loading the OCR models per process.
+        self.use_processes = use_processes
+        if use_processes:
+            self._pool = ProcessPoolExecutor(
+                max_workers=2, mp_context=multiprocessing.get_context("spawn"),
+                initializer=_ocr_worker_init, initargs=(class_config, quantize_vietocr))
+        else:
+            self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="ocr")
+        
+        # Decoded pages, so OCR of several boxes on one image decodes it once
+        # and stepping back and forth between neighbouring images stays warm
+        self._decode_image = functools.lru_cache(maxsize=4)(self._read_image)
+    
+    def _read_image(self, image_path: str, mtime_ns: int, grayscale: bool):
+        """Decode an image with OpenCV (cached by path, mtime and color mode)"""
+        cv2 = _LazyOCR.get().cv2
+        return cv2.imread(image_path, cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR)
+    
+    def _load_image(self, image_path: str, ocr_engine: str = "tesseract"):
+        """Load an image for OCR, reusing the cached decode when the file is unchanged
+        
+        Tesseract only ever sees binarized crops, so for it pages are decoded
+        straight to grayscale unless the class config sets ocr_grayscale to
+        false. The other engines get color pages unless it is set to true.
+        """
+        try:
+            mtime_ns = os.stat(image_path).st_mtime_ns
+        except OSError:
+            return None
+        grayscale = self.class_config.get("ocr_grayscale", ocr_engine == "tesseract")
+        return self._decode_image(image_path, mtime_ns, grayscale)
+    
+    def clear_image_cache(self):
+        """Drop decoded pages, e.g. after switching to another directory"""
+        self._decode_image.cache_clear()
     
     def process_ocr(self, image_path: str, box: BoundingBox, ocr_engine: str = "tesseract", callback: Callable = None):
         """Process OCR for a bounding box with specified OCR engine"""
-        thread = threading.Thread(target=self._run_ocr_thread, args=(image_path, box, ocr_engine, callback))
-        thread.daemon = True
-        thread.start()
+        if self.use_processes:
+            future = self._pool.submit(_ocr_worker_run, image_path, box, ocr_engine)
+            future.add_done_callback(lambda f: self._deliver_process_result(f, box, callback))
+        else:
+            self._pool.submit(self._run_ocr_thread, image_path, box, ocr_engine, callback)
+    
+    def process_ocr_batch(self, image_path: str, boxes: List[BoundingBox], ocr_engine: str = "tesseract",
+                          callback: Callable = _noop, on_error: Callable = _noop, on_done: Callable = _noop):
+        """Process OCR for several boxes of one image, decoding the image only once
+        
+        Unlike process_ocr, results bypass on_ocr_complete/on_ocr_error:
+        each box's text is reported as callback(box, text), each failure as
+        on_error(message), and on_done() is called once after all boxes.
+        """
+        boxes = list(boxes)
+        if not boxes:
+            on_done()
+        elif self.use_processes:
+            # Each worker keeps its own decoded-page cache
+            remaining = [len(boxes)]
+            lock = threading.Lock()
+            
+            def deliver(future, box):
+                try:
+                    callback(box, future.result())
+                except OCRError as e:
+                    on_error(str(e))
+                except Exception as e:
+                    on_error(f"OCR error: {str(e)}")
+                with lock:
+                    remaining[0] -= 1
+                    finished = remaining[0] == 0
+                if finished:
+                    on_done()
+            
+            for box in boxes:
+                future = self._pool.submit(_ocr_worker_run, image_path, box, ocr_engine)
+                future.add_done_callback(lambda f, box=box: deliver(f, box))
+        else:
+            self._pool.submit(self._run_ocr_batch_thread, image_path, boxes, ocr_engine,
+                              callback, on_error, on_done)
+    
+    def close(self):
+        """Stop accepting OCR work and release the worker threads"""
+        self._pool.shutdown(wait=False)
+        self.tesseract_worker.close()
     
     def _run_ocr_thread(self, image_path: str, box: BoundingBox, ocr_engine: str = "tesseract", callback: Callable = None):
         """Run OCR in background thread"""
         try:
-            print(f"[OCR] Starting OCR thread for image: {image_path}")
-            print(f"[OCR] Box coordinates: x={box.x}, y={box.y}, w={box.width}, h={box.height}, class_id={box.class_id}")
-            
-            # Import dependencies
+            final_text = self.recognize_box(image_path, box, ocr_engine)
+        except OCRError as e:
+            if self.on_ocr_error:
+                self.on_ocr_error(str(e))
+            return
+        except Exception as e:
+            log.exception("Exception in OCR thread")
+            if self.on_ocr_error:
+                self.on_ocr_error(f"OCR error: {str(e)}")
+            return
+        
+        # Call completion callback
+        log.debug("Calling completion callback...")
+        if self.on_ocr_complete:
+            self.on_ocr_complete(final_text, box.ocr_text)
+        
+        if callback:
+            callback(final_text)
+        
+        log.debug("OCR thread completed successfully")
+    
+    def _deliver_process_result(self, future, box: BoundingBox, callback: Callable = None):
+        """Report the outcome of an OCR job that ran in a worker process"""
+        try:
+            final_text = future.result()
+        except OCRError as e:
+            if self.on_ocr_error:
+                self.on_ocr_error(str(e))
+            return
+        except Exception as e:
+            if self.on_ocr_error:
+                self.on_ocr_error(f"OCR error: {str(e)}")
+            return
+        
+        if self.on_ocr_complete:
+            self.on_ocr_complete(final_text, box.ocr_text)
+        
+        if callback:
+            callback(final_text)
+    
+    def recognize_box(self, image_path: str, box: BoundingBox, ocr_engine: str = "tesseract") -> str:
+        """Run OCR for one box synchronously and return the post-processed text
+        
+        Raises OCRError with a user-facing message for expected failures.
+        """
+        log.debug("Starting OCR for image: %s", image_path)
+        log.debug("Box coordinates: x=%s, y=%s, w=%s, h=%s, class_id=%s", box.x, box.y, box.width, box.height, box.class_id)
+        
+        # Import dependencies
+        try:
+            ocr = _LazyOCR.get()
+        except ImportError as e:
+            log.debug("Import error: %s", e)
+            raise OCRError(f"Required OCR libraries not available: {str(e)}\nInstall: pip install pytesseract pillow opencv-python")
+        
+        # Load image
+        log.debug("Loading image: %s", image_path)
+        image = self._load_image(image_path, ocr_engine)
+        if image is None:
+            log.debug("Failed to load image")
+            raise OCRError("Failed to load image")
+        
+        log.debug("Image loaded successfully, shape: %s", image.shape)
+        
+        # Extract ROI
+        x, y, w, h = int(box.x), int(box.y), int(box.width), int(box.height)
+        img_height, img_width = image.shape[:2]
+        
+        log.debug("Original coordinates: x=%s, y=%s, w=%s, h=%s", x, y, w, h)
+        log.debug("Image dimensions: %sx%s", img_width, img_height)
+        
+        # Clamp coordinates
+        x = max(0, min(x, img_width - 1))
+        y = max(0, min(y, img_height - 1))
+        w = max(1, min(w, img_width - x))
+        h = max(1, min(h, img_height - y))
+        
+        log.debug("Clamped coordinates: x=%s, y=%s, w=%s, h=%s", x, y, w, h)
+        
+        roi = image[y:y+h, x:x+w]
+        log.debug("ROI extracted, shape: %s", roi.shape)
+        
+        if roi.size == 0:
+            log.debug("ROI size is 0")
+            raise OCRError("Invalid label region")
+        
+        return self._recognize_roi(ocr, roi, box, ocr_engine)
+    
+    def _run_ocr_batch_thread(self, image_path: str, boxes: List[BoundingBox], ocr_engine: str,
+                              callback: Callable, on_error: Callable, on_done: Callable):
+        """Run OCR for a batch of boxes in background thread"""
+        try:
             try:
-                print("[OCR] Importing dependencies...")
-                import pytesseract
-                from PIL import Image
-                import cv2
-                import numpy as np
-                print("[OCR] Dependencies imported successfully")
+                ocr = _LazyOCR.get()
             except ImportError as e:
-                print(f"[OCR] Import error: {e}")
-                error_msg = f"Required OCR libraries not available: {str(e)}\nInstall: pip install pytesseract pillow opencv-python"
-                if self.on_ocr_error:
-                    self.on_ocr_error(error_msg)
+                on_error(f"Required OCR libraries not available: {str(e)}\nInstall: pip install pytesseract pillow opencv-python")
                 return
             
-            # Load image
-            print(f"[OCR] Loading image: {image_path}")
-            image = cv2.imread(image_path)
+            np = ocr.np
+            image = self._load_image(image_path, ocr_engine)
             if image is None:
-                print("[OCR] Failed to load image")
-                if self.on_ocr_error:
-                    self.on_ocr_error("Failed to load image")
+                on_error("Failed to load image")
                 return
             
-            print(f"[OCR] Image loaded successfully, shape: {image.shape}")
-            
-            # Extract ROI
-            x, y, w, h = int(box.x), int(box.y), int(box.width), int(box.height)
+            # Clamp every box to the image in one pass
             img_height, img_width = image.shape[:2]
-            
-            print(f"[OCR] Original coordinates: x={x}, y={y}, w={w}, h={h}")
-            print(f"[OCR] Image dimensions: {img_width}x{img_height}")
-            
-            # Clamp coordinates
-            x = max(0, min(x, img_width - 1))
-            y = max(0, min(y, img_height - 1))
-            w = max(1, min(w, img_width - x))
-            h = max(1, min(h, img_height - y))
-            
-            print(f"[OCR] Clamped coordinates: x={x}, y={y}, w={w}, h={h}")
-            
-            roi = image[y:y+h, x:x+w]
-            print(f"[OCR] ROI extracted, shape: {roi.shape}")
-            
-            if roi.size == 0:
-                print("[OCR] ROI size is 0")
-                if self.on_ocr_error:
-                    self.on_ocr_error("Invalid label region")
+            rects = np.array([[b.x, b.y, b.width, b.height] for b in boxes], dtype=np.int32)
+            xs = np.clip(rects[:, 0], 0, img_width - 1)
+            ys = np.clip(rects[:, 1], 0, img_height - 1)
+            ws = np.clip(rects[:, 2], 1, img_width - xs)
+            hs = np.clip(rects[:, 3], 1, img_height - ys)
+            
+            recognize = self._recognize_roi
+            rois = [image[y:y+h, x:x+w]
+                    for x, y, w, h in zip(xs.tolist(), ys.tolist(), ws.tolist(), hs.tolist())]
+            
+            # VietOCR recognizes all crops of the page in one batched call
+            if ocr_engine == "vietocr" and len(boxes) > 1:
+                try:
+                    texts = self._run_vietocr_batch(ocr, rois, boxes)
+                except Exception as e:
+                    on_error(f"OCR error: {str(e)}")
+                    return
+                for box, final_text in zip(boxes, texts):
+                    callback(box, final_text)
                 return
             
-            # Preprocess image
-            print("[OCR] Starting image preprocessing...")
-            try:
-                processed_roi = ImageOperations.preprocess_image_by_field_type(
-                    roi, box.class_id, self.class_config)
-                print(f"[OCR] Image preprocessing completed, shape: {processed_roi.shape}")
-            except Exception as e:
-                print(f"[OCR] Preprocessing error: {e}")
-                processed_roi = roi  # Fallback to original ROI
-            
-            # Convert to PIL Image
-            print("[OCR] Converting to PIL Image...")
-            try:
-                pil_image = Image.fromarray(processed_roi)
-                print(f"[OCR] PIL Image created, mode: {pil_image.mode}, size: {pil_image.size}")
-            except Exception as e:
-                print(f"[OCR] PIL conversion error: {e}")
-                # Try with RGB conversion
-                if len(processed_roi.shape) == 3:
-                    processed_roi = cv2.cvtColor(processed_roi, cv2.COLOR_BGR2RGB)
-                pil_image = Image.fromarray(processed_roi)
-                print(f"[OCR] PIL Image created after RGB conversion, mode: {pil_image.mode}")
-            
-            # Run OCR based on selected engine
-            print(f"[OCR] Using OCR engine: {ocr_engine}")
-            
-            if ocr_engine == "tesseract":
-                final_text = self._run_tesseract_ocr(pil_image, box)
-            elif ocr_engine == "easyocr":
-                final_text = self._run_easyocr_ocr(pil_image, box)
-            elif ocr_engine == "paddleocr":
-                final_text = self._run_paddleocr_ocr(pil_image, box)
-            elif ocr_engine == "vietocr":
-                final_text = self._run_vietocr_ocr(pil_image, box)
-            else:
-                raise ValueError(f"Unknown OCR engine: {ocr_engine}")
-            
-            # Call completion callback
-            print("[OCR] Calling completion callback...")
-            if self.on_ocr_complete:
-                self.on_ocr_complete(final_text, box.ocr_text)
-            
-            if callback:
-                callback(final_text)
-            
-            print("[OCR] OCR thread completed successfully")
+            for box, roi in zip(boxes, rois):
+                try:
+                    final_text = recognize(ocr, roi, box, ocr_engine)
+                except Exception as e:
+                    on_error(f"OCR error: {str(e)}")
+                    continue
+                callback(box, final_text)
                 
         except Exception as e:
-            print(f"[OCR] Exception in OCR thread: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            if self.on_ocr_error:
-                self.on_ocr_error(f"OCR error: {str(e)}")
+            log.exception("Exception in OCR batch thread")
+            on_error(f"OCR error: {str(e)}")
+        finally:
+            on_done()
     
-    def _run_tesseract_ocr(self, pil_image, box: BoundingBox) -> str:
-        """Run Tesseract OCR on the image"""
-        print("[OCR] Running Tesseract OCR...")
+    def _prepare_roi(self, ocr, roi, box: BoundingBox):
+        """Preprocess an extracted ROI for its class, returning grayscale or RGB"""
+        cv2 = ocr.cv2
         
-        # Import Tesseract
+        # Preprocess image
+        log.debug("Starting image preprocessing...")
         try:
-            import pytesseract
-        except ImportError as e:
-            raise ImportError("Tesseract not available. Install: pip install pytesseract")
+            processed_roi = ImageOperations.preprocess_image_by_field_type(
+                roi, box.class_id, self.class_config)
+            log.debug("Image preprocessing completed, shape: %s", processed_roi.shape)
+        except Exception as e:
+            log.warning("Preprocessing error: %s", e)
+            processed_roi = roi  # Fallback to original ROI
+        
+        # Engines get grayscale or RGB; OpenCV's color ROIs are BGR
+        if processed_roi.ndim == 3:
+            processed_roi = cv2.cvtColor(processed_roi, cv2.COLOR_BGR2RGB)
+        return processed_roi
+    
+    def _recognize_roi(self, ocr, roi, box: BoundingBox, ocr_engine: str) -> str:
+        """Preprocess an extracted ROI and run the selected OCR engine on it"""
+        processed_roi = self._prepare_roi(ocr, roi, box)
+        
+        # Run OCR based on selected engine. Tesseract needs a PIL Image,
+        # the others take the array as is.
+        log.debug("Using OCR engine: %s", ocr_engine)
+        
+        if ocr_engine == "tesseract":
+            final_text = self._run_tesseract_ocr(ocr.Image.fromarray(processed_roi), box)
+        elif ocr_engine == "easyocr":
+            final_text = self._run_easyocr_ocr(processed_roi, box)
+        elif ocr_engine == "paddleocr":
+            final_text = self._run_paddleocr_ocr(processed_roi, box)
+        elif ocr_engine == "vietocr":
+            final_text = self._run_vietocr_ocr(processed_roi, box)
+        else:
+            raise ValueError(f"Unknown OCR engine: {ocr_engine}")
+        
+        return final_text
+    
+    def _run_tesseract_ocr(self, pil_image, box: BoundingBox) -> str:
+        """Run Tesseract OCR on the image"""
+        log.debug("Running Tesseract OCR...")
         
         # Get Tesseract config
-        print("[OCR] Getting Tesseract config...")
+        log.debug("Getting Tesseract config...")
         try:
-            custom_config = ImageOperations.get_tesseract_config_for_class(
-                box.class_id, self.class_config)
-            print(f"[OCR] Tesseract config: {custom_config}")
+            # The config depends only on the class, so build it once per class
+            custom_config = self._tesseract_configs.get(box.class_id)
+            if custom_config is None:
+                custom_config = self._tesseract_configs[box.class_id] = \
+                    ImageOperations.get_tesseract_config_for_class(box.class_id, self.class_config)
+            log.debug("Tesseract config: %s", custom_config)
         except Exception as e:
-            print(f"[OCR] Config error: {e}")
+            log.warning("Config error: %s", e)
             custom_config = ""  # Fallback to default config
         
         # Run OCR
         try:
-            extracted_text = pytesseract.image_to_string(
-                pil_image, config=custom_config).strip()
-            print(f"[OCR] Tesseract completed, extracted text: '{extracted_text}'")
+            extracted_text = self.tesseract_worker.recognize(
+                pil_image, custom_config).strip()
+            log.debug("Tesseract completed, extracted text: '%s'", extracted_text)
         except Exception as e:
-            print(f"[OCR] Tesseract error: {e}")
+            log.warning("Tesseract error: %s", e)
             raise
         
         # Post-process text
-        print("[OCR] Post-processing text...")
+        log.debug("Post-processing text...")
         try:
             final_text = ImageOperations.postprocess_text_by_field_type(
                 extracted_text, box.class_id, self.class_config)
-            print(f"[OCR] Post-processing completed, final text: '{final_text}'")
+            log.debug("Post-processing completed, final text: '%s'", final_text)
         except Exception as e:
-            print(f"[OCR] Post-processing error: {e}")
+            log.warning("Post-processing error: %s", e)
             final_text = extracted_text  # Fallback to raw text
         
         return final_text
     
-    def _run_easyocr_ocr(self, pil_image, box: BoundingBox) -> str:
-        """Run EasyOCR on the image"""
-        print("[OCR] Running EasyOCR...")
+    def _run_easyocr_ocr(self, np_image, box: BoundingBox) -> str:
+        """Run EasyOCR on a grayscale or RGB image array"""
+        log.debug("Running EasyOCR...")
         
-        # Import EasyOCR and numpy
+        # Import EasyOCR
         try:
             import easyocr
-            import numpy as np
         except ImportError as e:
             raise ImportError("EasyOCR not available. Install: pip install easyocr")
         
         # Initialize reader if not already done
         if self.easyocr_reader is None:
-            print("[OCR] Initializing EasyOCR reader...")
+            log.debug("Initializing EasyOCR reader...")
             self.easyocr_reader = easyocr.Reader(['en'])
-            print("[OCR] EasyOCR reader initialized")
-        
-        # Convert PIL image to numpy array
-        np_image = np.array(pil_image)
+            log.debug("EasyOCR reader initialized")
         
         # Run EasyOCR
         try:
@@ -561,116 +1226,85 @@ class OCRProcessor:
             
             # Extract text from results
             extracted_text = " ".join([result[1] for result in results]).strip()
-            print(f"[OCR] EasyOCR completed, extracted text: '{extracted_text}'")
+            log.debug("EasyOCR completed, extracted text: '%s'", extracted_text)
         except Exception as e:
-            print(f"[OCR] EasyOCR error: {e}")
+            log.warning("EasyOCR error: %s", e)
             raise
         
         # Post-process text
-        print("[OCR] Post-processing text...")
+        log.debug("Post-processing text...")
         try:
             final_text = ImageOperations.postprocess_text_by_field_type(
                 extracted_text, box.class_id, self.class_config)
-            print(f"[OCR] Post-processing completed, final text: '{final_text}'")
+            log.debug("Post-processing completed, final text: '%s'", final_text)
         except Exception as e:
-            print(f"[OCR] Post-processing error: {e}")
+            log.warning("Post-processing error: %s", e)
             final_text = extracted_text  # Fallback to raw text
         
         return final_text
     
-    def _run_paddleocr_ocr(self, pil_image, box: BoundingBox) -> str:
-        """Run PaddleOCR on the image"""
-        print("[OCR] Running PaddleOCR...")
+    def _run_paddleocr_ocr(self, np_image, box: BoundingBox) -> str:
+        """Run PaddleOCR on a grayscale or RGB image array"""
+        log.debug("Running PaddleOCR...")
         
         # Import PaddleOCR - check what's available
         try:
             from paddleocr import PaddleOCR
-            from PIL import Image
-            import numpy as np
-            print("[OCR] Using PaddleOCR API")
+            log.debug("Using PaddleOCR API")
         except ImportError as e:
             raise ImportError("PaddleOCR not available. Install: pip install paddleocr")
         
-        # Create a fresh PaddleOCR instance for this OCR operation only
-        print("[OCR] Creating fresh PaddleOCR reader instance for this operation...")
-        try:
-            # Use minimal PaddleOCR configuration to avoid complex state issues
-            paddleocr_reader = PaddleOCR()
-            print("[OCR] Fresh PaddleOCR reader created successfully")
-        except Exception as e:
-            print(f"[OCR] Fresh PaddleOCR creation failed: {e}")
-            # If we can't create a fresh instance, the system may have deeper issues
-            raise e
+        cv2 = _LazyOCR.get().cv2
         
-        # Convert PIL image to numpy array and ensure it's in the correct format
         # PaddleOCR works better with higher resolution and good contrast
         
         # Scale up small images for better OCR results
-        original_size = pil_image.size
-        if min(original_size) < 32:
+        height, width = np_image.shape[:2]
+        if min(width, height) < 32:
             # Scale up very small images
-            scale_factor = max(2, 64 // min(original_size))
-            new_size = (original_size[0] * scale_factor, original_size[1] * scale_factor)
-            pil_image = pil_image.resize(new_size, Image.LANCZOS)
-            print(f"[OCR] Scaled up image from {original_size} to {new_size}")
-        
-        if pil_image.mode != 'RGB':
-            print(f"[OCR] Converting image from {pil_image.mode} to RGB")
-            pil_image = pil_image.convert('RGB')
-        
-        np_image = np.array(pil_image)
-        print(f"[OCR] Image shape: {np_image.shape}, dtype: {np_image.dtype}")
-        
-        # Ensure image has 3 dimensions (height, width, channels)
-        if len(np_image.shape) == 2:
-            # Grayscale image, convert to RGB by stacking
-            print("[OCR] Converting grayscale to RGB format")
-            np_image = np.stack([np_image] * 3, axis=-1)
-        elif len(np_image.shape) == 3 and np_image.shape[2] == 1:
-            # Single channel with explicit dimension
-            print("[OCR] Converting single channel to RGB format")
-            np_image = np.concatenate([np_image] * 3, axis=2)
-        elif len(np_image.shape) == 3 and np_image.shape[2] == 4:
-            # RGBA image, remove alpha channel
-            print("[OCR] Converting RGBA to RGB format")
-            np_image = np_image[:, :, :3]
-        
-        print(f"[OCR] Final image shape for PaddleOCR: {np_image.shape}")
+            scale_factor = max(2, 64 // min(width, height))
+            np_image = cv2.resize(np_image, (width * scale_factor, height * scale_factor),
+                                  interpolation=cv2.INTER_LANCZOS4)
+            log.debug("Scaled up image from %s to %s", (width, height), (width * scale_factor, height * scale_factor))
+        
+        # PaddleOCR expects three RGB channels
+        if np_image.ndim == 2:
+            log.debug("Converting grayscale to RGB format")
+            np_image = cv2.cvtColor(np_image, cv2.COLOR_GRAY2RGB)
+        
+        log.debug("Final image shape for PaddleOCR: %s", np_image.shape)
+        
+        # Reuse one PaddleOCR reader; model loading dominates a fresh instance
+        with OCRProcessor._paddle_lock:
+            if OCRProcessor._paddle_reader is None:
+                log.debug("Creating PaddleOCR reader...")
+                # Use minimal PaddleOCR configuration to avoid complex state issues
+                OCRProcessor._paddle_reader = PaddleOCR()
         
         # Run PaddleOCR
         try:
             # Use standard ocr method which is more stable than predict
-            results = paddleocr_reader.ocr(np_image)
-            print(f"[OCR] PaddleOCR ocr results type: {type(results)}")
+            with OCRProcessor._paddle_lock:
+                results = OCRProcessor._paddle_reader.ocr(np_image)
+            log.debug("PaddleOCR ocr results type: %s", type(results))
             extracted_text = self._parse_standard_paddleocr_results(results)
             
-            print(f"[OCR] PaddleOCR completed, extracted text: '{extracted_text}'")
+            log.debug("PaddleOCR completed, extracted text: '%s'", extracted_text)
         except Exception as e:
-            print(f"[OCR] PaddleOCR error during processing: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("PaddleOCR error during processing: %s", e)
             # Return empty string instead of raising to allow graceful fallback
             return ""
         
         # Post-process text
-        print("[OCR] Post-processing text...")
+        log.debug("Post-processing text...")
         try:
             final_text = ImageOperations.postprocess_text_by_field_type(
                 extracted_text, box.class_id, self.class_config)
-            print(f"[OCR] Post-processing completed, final text: '{final_text}'")
+            log.debug("Post-processing completed, final text: '%s'", final_text)
         except Exception as e:
-            print(f"[OCR] Post-processing error: {e}")
+            log.warning("Post-processing error: %s", e)
             final_text = extracted_text  # Fallback to raw text
         
-        # Clean up PaddleOCR instance to prevent state corruption
-        print("[OCR] Cleaning up PaddleOCR instance...")
-        try:
-            if 'paddleocr_reader' in locals() and paddleocr_reader is not None:
-                del paddleocr_reader
-                print("[OCR] PaddleOCR instance cleaned up successfully")
-        except Exception as cleanup_error:
-            print(f"[OCR] Cleanup error (non-critical): {cleanup_error}")
-        
         return final_text
     
     def _parse_standard_paddleocr_results(self, results) -> str:
@@ -678,22 +1312,23 @@ class OCRProcessor:
         extracted_text = ""
         
         if results is None:
-            print("[OCR] Standard PaddleOCR returned None")
+            log.debug("Standard PaddleOCR returned None")
             return ""
         
         try:
             # Debug: print structure (safely)
-            print(f"[OCR] Standard PaddleOCR results type: {type(results)}")
-            print(f"[OCR] Results length: {len(results) if isinstance(results, list) else 'not a list'}")
+            log.debug("Standard PaddleOCR results type: %s", type(results))
+            log.debug("Results length: %s", len(results) if isinstance(results, list) else 'not a list')
             
             # Based on the logs showing complex nested structure, try multiple parsing approaches
             if isinstance(results, list) and len(results) > 0:
                 first_result = results[0]
-                print(f"[OCR] First result type: {type(first_result)}")
+                log.debug("First result type: %s", type(first_result))
                 
                 # Approach 1: Standard PaddleOCR format: [[[bbox], (text, confidence)], ...]
                 if isinstance(first_result, list):
-                    print(f"[OCR] First result is list with {len(first_result)} items")
+                    log.debug("First result is list with %s items", len(first_result))
+                    fragments = []
                     for detection in first_result:
                         try:
                             if isinstance(detection, list) and len(detection) >= 2:
@@ -702,83 +1337,76 @@ class OCRProcessor:
                                 if isinstance(text_data, (list, tuple)) and len(text_data) >= 1:
                                     text = str(text_data[0])
                                     if text and text.strip():
-                                        extracted_text += text + " "
-                                        print(f"[OCR] Extracted text fragment: '{text}'")
+                                        fragments.append(text)
+                                        log.debug("Extracted text fragment: '%s'", text)
                         except (IndexError, TypeError) as e:
-                            print(f"[OCR] Error parsing detection: {e}")
+                            log.debug("Error parsing detection: %s", e)
                             continue
+                    extracted_text = " ".join(fragments)
                 
                 # Approach 2: Handle complex PaddleX-style nested structure  
                 elif isinstance(first_result, dict):
-                    print("[OCR] First result is dict, trying to extract text fields")
+                    log.debug("First result is dict, trying to extract text fields")
                     extracted_text = self._extract_text_from_dict(first_result)
                 
                 # Approach 3: Handle single string result
                 elif isinstance(first_result, str):
-                    print("[OCR] First result is string")
+                    log.debug("First result is string")
                     extracted_text = first_result
             
             extracted_text = extracted_text.strip()
-            print(f"[OCR] Final extracted text: '{extracted_text}'")
+            log.debug("Final extracted text: '%s'", extracted_text)
             
         except Exception as e:
-            print(f"[OCR] Error parsing standard PaddleOCR results: {e}")
-            import traceback
-            traceback.print_exc()
+            log.exception("Error parsing standard PaddleOCR results: %s", e)
             
         return extracted_text
     
     def _extract_text_from_dict(self, result_dict, depth=0) -> str:
         """Extract text from complex nested dictionary structure"""
+        parts = []
+        self._collect_text_from_dict(result_dict, parts, depth)
+        return "".join(parts)
+    
+    def _collect_text_from_dict(self, result_dict, parts: List[str], depth: int):
+        """Append each text fragment found in result_dict, followed by a space, to parts"""
         if depth > 5:  # Prevent infinite recursion
-            return ""
-        
-        extracted = ""
+            return
         
-        # Look for common text field names
-        text_fields = ['text', 'rec_text', 'ocr_text', 'recognized_text', 'result_text']
+        start = len(parts)
         
-        for field in text_fields:
-            if field in result_dict:
+        # Look for common text field names, in priority order
+        present = _TEXT_FIELD_SET & result_dict.keys()
+        for field in _TEXT_FIELDS:
+            if field in present:
                 value = result_dict[field]
                 if isinstance(value, str) and value.strip():
-                    extracted += value + " "
-                    print(f"[OCR] Found text in field '{field}': '{value}'")
+                    parts += (value, " ")
+                    log.debug("Found text in field '%s': '%s'", field, value)
                 elif isinstance(value, list):
                     for item in value:
                         if isinstance(item, str) and item.strip():
-                            extracted += item + " "
+                            parts += (item, " ")
                         elif isinstance(item, dict):
-                            extracted += self._extract_text_from_dict(item, depth + 1)
+                            self._collect_text_from_dict(item, parts, depth + 1)
         
         # If no direct text fields found, search recursively
-        if not extracted:
+        if len(parts) == start:
             for key, value in result_dict.items():
                 if isinstance(value, dict):
-                    extracted += self._extract_text_from_dict(value, depth + 1)
+                    self._collect_text_from_dict(value, parts, depth + 1)
                 elif isinstance(value, list):
                     for item in value:
                         if isinstance(item, dict):
-                            extracted += self._extract_text_from_dict(item, depth + 1)
+                            self._collect_text_from_dict(item, parts, depth + 1)
                         elif isinstance(item, str) and item.strip():
-                            extracted += item + " "
-        
-        return extracted
+                            parts += (item, " ")
     
-    def _run_vietocr_ocr(self, pil_image, box: BoundingBox) -> str:
-        """Run VietOCR on the image for Vietnamese text recognition"""
-        print("[OCR] Running VietOCR...")
-        
-        # Import VietOCR
-        try:
-            from vietocr.tool.predictor import Predictor
-            from vietocr.tool.config import Cfg
-            print("[OCR] VietOCR modules imported successfully")
-        except ImportError as e:
-            raise ImportError("VietOCR not available. Install: pip install vietocr")
-        
+    @staticmethod
+    def _create_vietocr_predictor(Predictor, Cfg, quantize: bool = False):
+        """Load the pretrained Vietnamese transformer model"""
         # Get VietOCR configuration
-        print("[OCR] Setting up VietOCR configuration...")
+        log.debug("Setting up VietOCR configuration...")
         try:
             # Load pretrained Vietnamese transformer model
             config = Cfg.load_config_from_name('vgg_transformer')
@@ -789,80 +1417,179 @@ class OCRProcessor:
             # Ensure reproducible results
             config['predictor']['beamsearch'] = False
             
-            print(f"[OCR] VietOCR config loaded: device={config['device']}")
+            log.debug("VietOCR config loaded: device=%s", config['device'])
         except Exception as e:
-            print(f"[OCR] VietOCR config error: {e}")
+            log.warning("VietOCR config error: %s", e)
             raise e
         
         # Initialize VietOCR predictor
-        print("[OCR] Initializing VietOCR predictor...")
+        log.debug("Initializing VietOCR predictor...")
         try:
             detector = Predictor(config)
-            print("[OCR] VietOCR predictor initialized successfully")
+            log.debug("VietOCR predictor initialized successfully")
         except Exception as e:
-            print(f"[OCR] VietOCR predictor initialization failed: {e}")
+            log.debug("VietOCR predictor initialization failed: %s", e)
             raise e
         
-        # Scale up small images for better OCR results (similar to PaddleOCR preprocessing)
-        original_size = pil_image.size
-        if min(original_size) < 32:
-            # Scale up very small images
-            from PIL import Image
-            scale_factor = max(2, 64 // min(original_size))
-            new_size = (original_size[0] * scale_factor, original_size[1] * scale_factor)
-            pil_image = pil_image.resize(new_size, Image.LANCZOS)
-            print(f"[OCR] Scaled up image from {original_size} to {new_size}")
-        
-        # Run OCR
-        print("[OCR] Running VietOCR prediction...")
+        if quantize:
+            OCRProcessor._quantize_vietocr_model(detector)
+        return detector
+    
+    @staticmethod
+    def _quantize_vietocr_model(detector):
+        """Swap the model's Linear layers for dynamically quantized int8 ones
+        
+        On CPU this speeds up the transformer's matrix products, using the
+        quantization engine torch picks for the platform (fbgemm/x86 on
+        Intel and AMD, qnnpack on ARM). On failure the FP32 model is kept.
+        """
         try:
-            extracted_text = detector.predict(pil_image, return_prob=False)
-            if extracted_text is None:
-                extracted_text = ""
-            extracted_text = str(extracted_text).strip()
-            print(f"[OCR] VietOCR completed, extracted text: '{extracted_text}'")
+            import torch
+            detector.model = torch.quantization.quantize_dynamic(
+                detector.model, {torch.nn.Linear}, dtype=torch.qint8)
+            log.debug("VietOCR model quantized to int8 (%s)", torch.backends.quantized.engine)
         except Exception as e:
-            print(f"[OCR] VietOCR prediction error: {e}")
-            raise
+            log.warning("VietOCR int8 quantization failed, using FP32: %s", e)
+    
+    def _get_vietocr_predictor(self):
+        """Return the shared VietOCR predictor, loading the model on first use"""
+        # Import VietOCR
+        try:
+            from vietocr.tool.predictor import Predictor
+            from vietocr.tool.config import Cfg
+            log.debug("VietOCR modules imported successfully")
+        except ImportError as e:
+            raise ImportError("VietOCR not available. Install: pip install vietocr")
+        
+        # Reuse one VietOCR predictor; building it loads the model weights
+        with OCRProcessor._vietocr_lock:
+            if OCRProcessor._vietocr_predictor is None:
+                OCRProcessor._vietocr_predictor = self._create_vietocr_predictor(
+                    Predictor, Cfg, self.quantize_vietocr)
+            return OCRProcessor._vietocr_predictor
+    
+    @staticmethod
+    def _vietocr_image(ocr, np_image):
+        """Upscale a small ROI and convert it to the PIL image VietOCR expects"""
+        # Scale up small images for better OCR results (same as PaddleOCR);
+        # resample in OpenCV and hand VietOCR a PIL image only at the end
+        height, width = np_image.shape[:2]
+        if min(width, height) < 32:
+            # Scale up very small images
+            scale_factor = max(2, 64 // min(width, height))
+            new_size = (width * scale_factor, height * scale_factor)
+            np_image = ocr.cv2.resize(np_image, new_size, interpolation=ocr.cv2.INTER_LANCZOS4)
+            log.debug("Scaled up image from %s to %s", (width, height), new_size)
+        return ocr.Image.fromarray(np_image)
+    
+    def _postprocess_vietocr_text(self, extracted_text, box: BoundingBox) -> str:
+        """Normalize a VietOCR prediction and apply the class's text rules"""
+        if extracted_text is None:
+            extracted_text = ""
+        extracted_text = str(extracted_text).strip()
+        log.debug("VietOCR completed, extracted text: '%s'", extracted_text)
         
         # Post-process text
-        print("[OCR] Post-processing text...")
+        log.debug("Post-processing text...")
         try:
             final_text = ImageOperations.postprocess_text_by_field_type(
                 extracted_text, box.class_id, self.class_config)
-            print(f"[OCR] Post-processing completed, final text: '{final_text}'")
+            log.debug("Post-processing completed, final text: '%s'", final_text)
         except Exception as e:
-            print(f"[OCR] Post-processing error: {e}")
+            log.warning("Post-processing error: %s", e)
             final_text = extracted_text  # Fallback to raw text
         
-        # Clean up VietOCR predictor to prevent memory issues
-        print("[OCR] Cleaning up VietOCR predictor...")
+        return final_text
+    
+    def _run_vietocr_ocr(self, np_image, box: BoundingBox) -> str:
+        """Run VietOCR on the image for Vietnamese text recognition"""
+        log.debug("Running VietOCR...")
+        predictor = self._get_vietocr_predictor()
+        pil_image = self._vietocr_image(_LazyOCR.get(), np_image)
+        
+        # Run OCR
+        log.debug("Running VietOCR prediction...")
         try:
-            if 'detector' in locals() and detector is not None:
-                del detector
-                print("[OCR] VietOCR predictor cleaned up successfully")
-        except Exception as cleanup_error:
-            print(f"[OCR] Cleanup error (non-critical): {cleanup_error}")
+            with OCRProcessor._vietocr_lock:
+                extracted_text = predictor.predict(pil_image, return_prob=False)
+        except Exception as e:
+            log.warning("VietOCR prediction error: %s", e)
+            raise
         
-        return final_text
+        return self._postprocess_vietocr_text(extracted_text, box)
+    
+    def _run_vietocr_batch(self, ocr, rois, boxes: List[BoundingBox]) -> List[str]:
+        """Run VietOCR on the ROIs of several boxes with one batched prediction
+        
+        predict_batch groups crops of similar width, so the transformer runs
+        once per group instead of once per box.
+        """
+        log.debug("Running VietOCR on %s boxes...", len(boxes))
+        predictor = self._get_vietocr_predictor()
+        images = [self._vietocr_image(ocr, self._prepare_roi(ocr, roi, box))
+                  for roi, box in zip(rois, boxes)]
+        
+        try:
+            with OCRProcessor._vietocr_lock:
+                texts = predictor.predict_batch(images, return_prob=False)
+        except Exception as e:
+            log.warning("VietOCR prediction error: %s", e)
+            raise
+        
+        return [self._postprocess_vietocr_text(text, box) for text, box in zip(texts, boxes)]
 
 
 class ConfirmationManager:
     """Manages confirmation status for files using SQLite database"""
     
+    # Upsert in place, keeping the row's id and created_at
+    _SQL_SAVE_CONFIRMATION = (
+        "INSERT INTO file_confirmations "
+        "(file_path, filename, confirmed, confirmed_at, updated_at) "
+        "VALUES (?, ?, ?, CASE WHEN ? THEN CURRENT_TIMESTAMP END, CURRENT_TIMESTAMP) "
+        "ON CONFLICT(file_path) DO UPDATE SET "
+        "confirmed = excluded.confirmed, "
+        "confirmed_at = CASE WHEN file_confirmations.confirmed = 1 AND excluded.confirmed = 1 "
+        "THEN file_confirmations.confirmed_at ELSE excluded.confirmed_at END, "
+        "updated_at = CURRENT_TIMESTAMP")
+    _SQL_LOAD_CONFIRMATIONS = "SELECT file_path, confirmed FROM file_confirmations"
+    _SQL_CONFIRMATION_STATS = (
+        "SELECT COUNT(*), COALESCE(SUM(confirmed = 1), 0) FROM file_confirmations")
+    _SQL_CONFIRMATION_PATHS = "SELECT file_path FROM file_confirmations"
+    _SQL_CONFIRMED_FILES = (
+        "SELECT file_path, filename, confirmed_at FROM file_confirmations "
+        "WHERE confirmed = 1 ORDER BY confirmed_at DESC")
+    
+    # Toggles arriving within this many seconds share one transaction
+    _GROUP_COMMIT_WINDOW = 0.2
+    
     def __init__(self, directory_path: str = None):
         self.confirmation_status = {}
+        self._confirmed_count = 0
         self.directory_path = directory_path
         self.db_path = None
         self.on_confirmation_changed = None
         
+        # Status changes are committed in bursts by a background thread
+        self._writer = _GroupCommitWriter(self._SQL_SAVE_CONFIRMATION, self._GROUP_COMMIT_WINDOW,
+                                          "confirmations")
+        # Commit queued changes if this manager is dropped or the app exits
+        # without close()
+        weakref.finalize(self, self._writer.close)
+        
         # Initialize database if directory provided
         if self.directory_path:
             self.init_database()
     
     def set_confirmation(self, file_path: str, confirmed: bool):
-        """Set confirmation status for a file"""
+        """Set confirmation status for a file
+        
+        The in-memory status changes at once; the database write is
+        deferred (see save_to_database).
+        """
+        previous = self.confirmation_status.get(file_path, False)
         self.confirmation_status[file_path] = confirmed
+        self._confirmed_count += bool(confirmed) - bool(previous)
         if self.on_confirmation_changed:
             self.on_confirmation_changed(file_path, confirmed)
         
@@ -882,7 +1609,7 @@ class ConfirmationManager:
     
     def get_confirmation_summary(self) -> Dict[str, int]:
         """Get summary of confirmation status"""
-        confirmed = sum(1 for status in self.confirmation_status.values() if status)
+        confirmed = self._confirmed_count
         total = len(self.confirmation_status)
         return {
             'confirmed': confirmed,
@@ -890,21 +1617,32 @@ class ConfirmationManager:
             'total': total
         }
     
+    def _connect(self) -> sqlite3.Connection:
+        """Get this thread's connection to the confirmation database"""
+        return _get_connection(self.db_path)
+    
+    def close(self):
+        """Write pending changes and close the confirmation database, e.g. when the window closes"""
+        self._writer.close()
+        _close_connection(self.db_path)
+    
+    def flush(self):
+        """Block until every status change queued by save_to_database is committed"""
+        self._writer.flush()
+    
     def init_database(self):
         """Initialize SQLite database for the current directory"""
         if not self.directory_path:
             return
         
         try:
-            import sqlite3
-            from pathlib import Path
-            
             # Create database file in the image directory
             dir_path = Path(self.directory_path)
+            self.flush()
             self.db_path = dir_path / '.label_editor.db'
             
             # Initialize database schema
-            conn = sqlite3.connect(str(self.db_path))
+            conn = self._connect()
             cursor = conn.cursor()
             
             # Create table if it doesn't exist
@@ -920,47 +1658,36 @@ class ConfirmationManager:
                 )
             ''')
             
-            # Create index for faster lookups
-            cursor.execute('''
-                CREATE INDEX IF NOT EXISTS idx_file_path ON file_confirmations(file_path)
-            ''')
+            # The UNIQUE constraint already indexes file_path
+            cursor.execute('DROP INDEX IF EXISTS idx_file_path')
             
             conn.commit()
-            conn.close()
             
             # Load existing confirmations into memory
             self.load_from_database()
             
         except Exception as e:
-            print(f"Error initializing database: {e}")
+            log.error("Error initializing database: %s", e)
     
     def save_to_database(self, file_path: str, confirmed: bool):
-        """Save confirmation status to SQLite database"""
+        """Save confirmation status to SQLite database
+        
+        The write is deferred: the row is queued and committed by the
+        writer thread within _GROUP_COMMIT_WINDOW seconds, together with
+        any other changes in that window. flush() waits for it; close(),
+        garbage collection and interpreter exit commit whatever is queued.
+        """
         if not self.db_path:
             return
         
         try:
-            import sqlite3
-            from pathlib import Path
-            
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            filename = os.path.basename(file_path)
             
-            filename = Path(file_path).name
-            confirmed_at = 'CURRENT_TIMESTAMP' if confirmed else None
-            
-            # Insert or update confirmation status
-            cursor.execute('''
-                INSERT OR REPLACE INTO file_confirmations 
-                (file_path, filename, confirmed, confirmed_at, updated_at)
-                VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
-            ''', (file_path, filename, int(confirmed), confirmed_at))
-            
-            conn.commit()
-            conn.close()
+            # Insert or update confirmation status; the writer thread commits it
+            self._writer.put(self.db_path, (file_path, filename, int(confirmed), int(confirmed)))
             
         except Exception as e:
-            print(f"Error saving to database: {e}")
+            log.error("Error saving to database: %s", e)
     
     def load_from_database(self):
         """Load confirmation status from SQLite database"""
@@ -968,28 +1695,24 @@ class ConfirmationManager:
             return
         
         try:
-            import sqlite3
-            from pathlib import Path
-            
             if not Path(self.db_path).exists():
                 return
             
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            self.flush()
+            conn = self._connect()
             
             # Load all confirmations
-            cursor.execute('SELECT file_path, confirmed FROM file_confirmations')
-            rows = cursor.fetchall()
+            rows = conn.execute(self._SQL_LOAD_CONFIRMATIONS).fetchall()
             
             self.confirmation_status = {}
             for file_path, confirmed in rows:
                 self.confirmation_status[file_path] = bool(confirmed)
-            
-            conn.close()
+            self._confirmed_count = sum(self.confirmation_status.values())
             
         except Exception as e:
-            print(f"Error loading from database: {e}")
+            log.error("Error loading from database: %s", e)
             self.confirmation_status = {}
+            self._confirmed_count = 0
     
     def get_confirmation_stats(self) -> dict:
         """Get detailed confirmation statistics from database"""
@@ -997,23 +1720,14 @@ class ConfirmationManager:
             return {'total': 0, 'confirmed': 0, 'unconfirmed': 0}
         
         try:
-            import sqlite3
-            from pathlib import Path
-            
             if not Path(self.db_path).exists():
                 return {'total': 0, 'confirmed': 0, 'unconfirmed': 0}
             
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            # Get statistics
-            cursor.execute('SELECT COUNT(*) FROM file_confirmations')
-            total = cursor.fetchone()[0]
-            
-            cursor.execute('SELECT COUNT(*) FROM file_confirmations WHERE confirmed = 1')
-            confirmed = cursor.fetchone()[0]
+            self.flush()
+            conn = self._connect()
             
-            conn.close()
+            # Get statistics in a single scan
+            total, confirmed = conn.execute(self._SQL_CONFIRMATION_STATS).fetchone()
             
             return {
                 'total': total,
@@ -1022,7 +1736,7 @@ class ConfirmationManager:
             }
             
         except Exception as e:
-            print(f"Error getting stats from database: {e}")
+            log.error("Error getting stats from database: %s", e)
             return {'total': 0, 'confirmed': 0, 'unconfirmed': 0}
     
     def sync_confirmation_db_with_directory(self, directory_path: str):
@@ -1031,45 +1745,34 @@ class ConfirmationManager:
             return
         
         try:
-            import sqlite3
-            from pathlib import Path
-            
             # Get all image files in directory
-            directory = Path(directory_path)
-            image_extensions = {'.jpg', '.jpeg', '.png', '.bmp', '.tiff', '.tif', '.gif'}
-            current_files = set()
-            
-            for file_path in directory.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                    current_files.add(str(file_path))
+            current_files = _list_image_files(directory_path)
             
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
+            self.flush()
+            conn = self._connect()
             
             # Get all file paths in database
-            cursor.execute('SELECT file_path FROM file_confirmations')
-            db_files = set(row[0] for row in cursor.fetchall())
+            db_files = {row[0] for row in conn.execute(self._SQL_CONFIRMATION_PATHS)}
             
             # Remove entries for files that no longer exist
             removed_files = db_files - current_files
             if removed_files:
+                with conn:
+                    _delete_where_in(conn, "file_confirmations", "file_path", removed_files)
+                log.info("Removed %s deleted file entries from confirmation database", len(removed_files))
+                
+                # Drop the same entries from memory instead of reloading every row
                 for file_path in removed_files:
-                    cursor.execute('DELETE FROM file_confirmations WHERE file_path = ?', (file_path,))
-                print(f"Removed {len(removed_files)} deleted file entries from confirmation database")
-            
-            conn.commit()
-            conn.close()
-            
-            # Reload confirmation status from database
-            self.load_from_database()
+                    self._confirmed_count -= bool(self.confirmation_status.pop(file_path, False))
             
         except Exception as e:
-            print(f"Error syncing confirmation database with directory: {e}")
+            log.error("Error syncing confirmation database with directory: %s", e)
     
     def set_directory(self, directory_path: str):
         """Set new directory and reinitialize database"""
         self.directory_path = directory_path
         self.confirmation_status = {}
+        self._confirmed_count = 0
         self.init_database()
     
     def get_confirmed_files(self) -> list:
@@ -1078,33 +1781,15 @@ class ConfirmationManager:
             return []
         
         try:
-            import sqlite3
-            from pathlib import Path
-            
             if not Path(self.db_path).exists():
                 return []
             
-            conn = sqlite3.connect(str(self.db_path))
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT file_path, filename, confirmed_at 
-                FROM file_confirmations 
-                WHERE confirmed = 1 
-                ORDER BY confirmed_at DESC
-            ''')
-            
-            confirmed_files = []
-            for row in cursor.fetchall():
-                confirmed_files.append({
-                    'path': row[0],
-                    'filename': row[1],
-                    'confirmed_at': row[2]
-                })
+            self.flush()
+            conn = self._connect()
             
-            conn.close()
-            return confirmed_files
+            return [{'path': path, 'filename': filename, 'confirmed_at': confirmed_at}
+                    for path, filename, confirmed_at in conn.execute(self._SQL_CONFIRMED_FILES)]
             
         except Exception as e:
-            print(f"Error getting confirmed files: {e}")
+            log.error("Error getting confirmed files: %s", e)
             return []
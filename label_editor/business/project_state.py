@@ -1,13 +1,19 @@
 #!/usr/bin/env python3
 
 import json
+import logging
+import os
+import threading
 import time
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 from concurrent.futures import ThreadPoolExecutor
+from ..core.file_io import DATParser
 from ..core.validation import ValidationEngine
 from ..core.settings_manager import SettingsManager
 
+log = logging.getLogger(__name__)
+
 
 class ProjectManager:
     """Manages project state including directory loading and file tracking"""
@@ -31,6 +37,9 @@ class ProjectManager:
         # Project state
         self.current_directory = None
         self.image_files = []
+        self._file_list_template = []
+        self._file_list_source = None
+        self._dat_names = None
         self.current_index = -1
         self.current_image_path = None
         self.current_dat_path = None
@@ -44,6 +53,13 @@ class ProjectManager:
         max_workers = self.settings_manager.get('performance.max_workers', 10)
         self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="gui_ops")
         
+        # Background DAT saves: image path -> latest unsaved boxes snapshot
+        self._pending_saves = {}
+        self._save_lock = threading.Lock()
+        self._save_wakeup = threading.Event()
+        self._save_thread = None
+        self._save_stopping = False
+        
         # Validation
         self.validation_engine = ValidationEngine(self.class_config)
         
@@ -128,32 +144,30 @@ class ProjectManager:
     def _parse_class_config(self) -> Dict[str, Any]:
         """Parse class configuration from config"""
         classes_data = self.config.get("classes")
-        if classes_data:
-            if isinstance(classes_data, dict) and "classes" in classes_data:
-                return classes_data
-            elif isinstance(classes_data, dict) and "classes" not in classes_data:
-                return {"classes": classes_data} if isinstance(classes_data, list) else classes_data
-            else:
-                return {"classes": classes_data} if isinstance(classes_data, list) else {"classes": []}
-        else:
-            return {"classes": []}
+        if isinstance(classes_data, list):
+            return {"classes": classes_data}
+        if isinstance(classes_data, dict) and classes_data:
+            return classes_data
+        return {"classes": []}
     
     def load_directory(self, directory_path: str) -> bool:
         """Load a directory and scan for image files"""
         try:
             self.current_directory = Path(directory_path)
-            self.image_files = []
             
-            # Scan for image files
-            for file_path in self.current_directory.iterdir():
-                if file_path.is_file() and file_path.suffix.lower() in self.image_extensions:
-                    self.image_files.append(file_path)
+            # Scan for image files; scandir's entries know their type from the
+            # directory listing, so only symlinks need an extra stat
+            suffixes = tuple(self.image_extensions)
+            with os.scandir(self.current_directory) as entries:
+                self.image_files = sorted(
+                    Path(entry.path) for entry in entries
+                    if entry.name.lower().endswith(suffixes) and entry.is_file())
+            self._build_file_list_template()
+            self._dat_names = None
             
-            self.image_files.sort()
-            
-            # Validate files
-            self.validation_engine.validation_cache = self.validation_engine.validate_all_files(
-                self.image_files, self.image_extensions)
+            # Validate files, reusing results from earlier sessions for DAT
+            # files that haven't changed since
+            self.validation_engine.validation_cache = self._validate_files()
             
             # Reset current image
             self.current_index = -1
@@ -182,6 +196,90 @@ class ProjectManager:
                 self.on_error(f"Error loading directory: {e}")
             return False
     
+    # Validation results kept between sessions, for this many directories
+    _VALIDATION_STORE_DIRS = 20
+    
+    def _validate_files(self) -> Dict[str, Dict[str, Any]]:
+        """Validate every image's DAT file, reusing stored results where possible
+        
+        A stored result is reused while the DAT file's mtime and size are
+        unchanged (or it is still missing) and the class configuration is the
+        one it was made with. Only the remaining files are read and parsed.
+        """
+        directory = str(self.current_directory)
+        store = self._load_validation_store()
+        previous = store['directories'].pop(directory, {})
+        
+        # DAT signatures from one directory listing, as lists so they compare
+        # equal to the ones read back from JSON
+        normcase = os.path.normcase
+        signatures = {}
+        with os.scandir(self.current_directory) as entries:
+            for entry in entries:
+                if entry.name[-4:].lower() == '.dat':
+                    stat = entry.stat()
+                    signatures[normcase(entry.name)] = [stat.st_mtime_ns, stat.st_size]
+        
+        validation_cache = {}
+        stored = {}
+        stale = []
+        for file_path in self.image_files:
+            path = str(file_path)
+            signature = signatures.get(normcase(file_path.stem + '.dat'))
+            entry = previous.get(path)
+            if entry is not None and entry[0] == signature:
+                stored[path] = entry
+                validation_cache[path] = entry[1]
+            else:
+                validation_cache[path] = None  # keeps the image order
+                stale.append((file_path, signature))
+        
+        # Each image's DAT file is independent, so read and parse them on the
+        # worker pool
+        results = self.executor.map(
+            self.validation_engine.validate_file, [file_path for file_path, _ in stale])
+        for (file_path, signature), result in zip(stale, results):
+            path = str(file_path)
+            validation_cache[path] = result
+            # The parsed boxes are only needed in memory
+            stored[path] = [signature, {k: v for k, v in result.items() if k != 'boxes'}]
+        
+        if stale or len(previous) != len(stored):
+            store['directories'][directory] = stored
+            self._save_validation_store(store)
+        return validation_cache
+    
+    def _validation_store_path(self) -> Path:
+        return self.settings_manager.base_dir / "validation_cache.json"
+    
+    def _load_validation_store(self) -> Dict[str, Any]:
+        """Load stored validation results, discarding them if the classes changed"""
+        try:
+            with open(self._validation_store_path(), 'r', encoding='utf-8') as f:
+                store = json.load(f)
+            if store['class_config'] == self.class_config:
+                return store
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            log.debug("Ignoring unreadable validation cache: %s", e)
+        return {'class_config': self.class_config, 'directories': {}}
+    
+    def _save_validation_store(self, store: Dict[str, Any]):
+        """Write stored validation results, keeping the most recent directories"""
+        directories = store['directories']
+        while len(directories) > self._VALIDATION_STORE_DIRS:
+            del directories[next(iter(directories))]
+        
+        store_path = self._validation_store_path()
+        tmp_path = store_path.with_suffix('.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(store, f, separators=(',', ':'))
+            os.replace(tmp_path, store_path)
+        except (OSError, TypeError, ValueError) as e:
+            log.debug("Could not write validation cache: %s", e)
+    
     def navigate_to_image(self, index: int) -> bool:
         """Navigate to specific image by index"""
         if 0 <= index < len(self.image_files):
@@ -229,19 +327,61 @@ class ProjectManager:
     
     def get_file_list(self) -> List[Dict[str, Any]]:
         """Get list of files with validation status"""
+        if self._file_list_source is not self.image_files:
+            self._build_file_list_template()
+        
+        # One directory listing answers has_dat for every row
+        dat_names = self._list_dat_names()
+        validation_cache = self.validation_engine.validation_cache
+        status_for = self.validation_engine.status_for
+        current_index = self.current_index
+        
+        # Callers annotate the rows, so each call hands out copies of the
+        # templates with only the changing fields filled in
         file_list = []
-        for i, file_path in enumerate(self.image_files):
-            validation = self.validation_engine.validation_cache.get(str(file_path), {})
-            file_list.append({
+        for template in self._file_list_template:
+            row = template.copy()
+            validation = validation_cache.get(row['path'], {})
+            row['validation_status'] = status_for(validation)
+            row['is_current'] = row['index'] == current_index
+            row['has_dat'] = row.pop('dat_name') in dat_names
+            row['box_count'] = validation.get('box_count', 0)
+            file_list.append(row)
+        return file_list
+    
+    def _build_file_list_template(self):
+        """Precompute the fixed per-file fields of get_file_list's rows"""
+        normcase = os.path.normcase
+        self._file_list_template = [
+            {
                 'index': i,
                 'name': file_path.name,
                 'path': str(file_path),
-                'validation_status': self.validation_engine.get_file_validation_status(str(file_path)),
-                'is_current': i == self.current_index,
-                'has_dat': file_path.with_suffix('.dat').exists(),
-                'box_count': validation.get('box_count', 0)
-            })
-        return file_list
+                'dat_name': normcase(file_path.stem + '.dat')
+            }
+            for i, file_path in enumerate(map(Path, self.image_files))
+        ]
+        self._file_list_source = self.image_files
+    
+    def _list_dat_names(self) -> set:
+        """Names of the .dat files in the current directory, case-folded where the OS does
+        
+        Creating or deleting a file updates the directory's mtime, so the
+        listing is reused until that changes: one stat instead of a scan.
+        """
+        if not self.current_directory:
+            return set()
+        try:
+            mtime = os.stat(self.current_directory).st_mtime_ns
+            if self._dat_names is not None and self._dat_names[0] == mtime:
+                return self._dat_names[1]
+            with os.scandir(self.current_directory) as entries:
+                names = {os.path.normcase(entry.name) for entry in entries
+                         if entry.name[-4:].lower() == '.dat'}
+        except OSError:
+            return set()
+        self._dat_names = (mtime, names)
+        return names
     
     def get_directory_stats(self) -> Dict[str, Any]:
         """Get directory statistics"""
@@ -262,27 +402,53 @@ class ProjectManager:
     # Removed find_first_unconfirmed_image - using simple next image navigation
     
     def perform_background_save(self, image_path: str, boxes_snapshot: List):
-        """Perform background save operation"""
-        def save_operation():
-            try:
-                from ..core.file_io import DATParser
-                image_path_obj = Path(image_path)
-                dat_path = image_path_obj.with_suffix('.dat')
-                
-                if boxes_snapshot:
+        """Save boxes to the image's DAT file on the background save thread
+        
+        Saves coalesce per image: a snapshot still waiting to be written is
+        replaced by the newer one, so fast edits cause one write, not many.
+        """
+        if not boxes_snapshot:
+            return
+        
+        with self._save_lock:
+            self._pending_saves[image_path] = boxes_snapshot
+            if self._save_thread is None:
+                self._save_thread = threading.Thread(
+                    target=self._run_saves, name="dat-save", daemon=True)
+                self._save_thread.start()
+        self._save_wakeup.set()
+    
+    def _run_saves(self):
+        """Write queued snapshots, one file at a time, until close() is called"""
+        while True:
+            self._save_wakeup.wait()
+            with self._save_lock:
+                self._save_wakeup.clear()
+                pending, self._pending_saves = self._pending_saves, {}
+                stopping = self._save_stopping
+            
+            for image_path, boxes_snapshot in pending.items():
+                try:
+                    dat_path = Path(image_path).with_suffix('.dat')
                     DATParser.save_dat_file(str(dat_path), boxes_snapshot)
                     self.last_save_time[image_path] = time.time()
-                    
-            except Exception as e:
-                if self.on_error:
-                    self.on_error(f"Error saving in background: {e}")
-        
-        self.executor.submit(save_operation)
+                except Exception as e:
+                    if self.on_error:
+                        self.on_error(f"Error saving in background: {e}")
+            
+            if stopping:
+                return
     
 # File permission changes removed - confirmation now only records status
     
     def close(self):
-        """Clean up resources"""
+        """Clean up resources, writing any queued saves first"""
+        with self._save_lock:
+            thread = self._save_thread
+            self._save_stopping = True
+        if thread is not None:
+            self._save_wakeup.set()
+            thread.join()
         if hasattr(self, 'executor'):
             self.executor.shutdown(wait=True)
 
@@ -312,19 +478,35 @@ class FileTracker:
         return self.confirmation_status.get(file_path, False)
     
     def add_pending_operation(self, operation_key: str, operation):
-        """Add pending operation"""
-        self.pending_operations[operation_key] = operation
+        """Add pending operation
+        
+        Keys have the form "<operation name>:<file path>"; operations are
+        grouped by file so status queries don't scan every pending key.
+        """
+        operation_name, file_path = self._split_operation_key(operation_key)
+        self.pending_operations.setdefault(file_path, {})[operation_name] = operation
     
     def remove_pending_operation(self, operation_key: str):
         """Remove pending operation"""
-        self.pending_operations.pop(operation_key, None)
+        operation_name, file_path = self._split_operation_key(operation_key)
+        operations = self.pending_operations.get(file_path)
+        if operations is not None:
+            operations.pop(operation_name, None)
+            if not operations:
+                del self.pending_operations[file_path]
+    
+    @staticmethod
+    def _split_operation_key(operation_key: str):
+        """Split an operation key into (operation name, file path)"""
+        operation_name, sep, file_path = operation_key.partition(':')
+        if not sep:
+            return '', operation_key
+        return operation_name, file_path
     
     def get_file_status(self, file_path: str) -> Dict[str, Any]:
         """Get comprehensive file status"""
         return {
             'last_saved': self.get_last_save_time(file_path),
             'confirmed': self.get_confirmation_status(file_path),
-            'has_pending_operations': any(
-                key.endswith(file_path) for key in self.pending_operations.keys()
-            )
+            'has_pending_operations': file_path in self.pending_operations
         }
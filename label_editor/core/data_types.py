@@ -4,6 +4,8 @@ from typing import Optional
 
 
 class BoundingBox:
+    __slots__ = ("x", "y", "width", "height", "class_id", "ocr_text", "selected", "name")
+
     def __init__(self, x: int, y: int, width: int, height: int, class_id: int, ocr_text: str = "", class_name: str = None):
         self.x = x
         self.y = y
@@ -19,20 +21,34 @@ class BoundingBox:
                 self.y <= y <= self.y + self.height)
 
     def get_resize_handle(self, x: int, y: int, handle_size: int = 8) -> Optional[str]:
-        if (abs(x - self.x) <= handle_size and abs(y - self.y) <= handle_size):
-            return "nw"
-        elif (abs(x - (self.x + self.width)) <= handle_size and abs(y - self.y) <= handle_size):
-            return "ne"
-        elif (abs(x - self.x) <= handle_size and abs(y - (self.y + self.height)) <= handle_size):
-            return "sw"
-        elif (abs(x - (self.x + self.width)) <= handle_size and abs(y - (self.y + self.height)) <= handle_size):
-            return "se"
-        elif (abs(x - self.x) <= handle_size and self.y <= y <= self.y + self.height):
+        x0, y0 = self.x, self.y
+        x1, y1 = x0 + self.width, y0 + self.height
+        # Most hover positions are nowhere near this box; every handle lies
+        # within handle_size of its outline
+        if not (x0 - handle_size <= x <= x1 + handle_size and
+                y0 - handle_size <= y <= y1 + handle_size):
+            return None
+
+        left = abs(x - x0) <= handle_size
+        right = abs(x - x1) <= handle_size
+        top = abs(y - y0) <= handle_size
+        bottom = abs(y - y1) <= handle_size
+        if top:
+            if left:
+                return "nw"
+            if right:
+                return "ne"
+        if bottom:
+            if left:
+                return "sw"
+            if right:
+                return "se"
+        if left and y0 <= y <= y1:
             return "w"
-        elif (abs(x - (self.x + self.width)) <= handle_size and self.y <= y <= self.y + self.height):
+        if right and y0 <= y <= y1:
             return "e"
-        elif (abs(y - self.y) <= handle_size and self.x <= x <= self.x + self.width):
+        if top and x0 <= x <= x1:
             return "n"
-        elif (abs(y - (self.y + self.height)) <= handle_size and self.x <= x <= self.x + self.width):
+        if bottom and x0 <= x <= x1:
             return "s"
         return None
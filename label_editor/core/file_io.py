@@ -1,8 +1,24 @@
 #!/usr/bin/env python3
 
+import logging
+import re
+from operator import attrgetter
 from typing import List
 from .data_types import BoundingBox
 
+log = logging.getLogger(__name__)
+
+# Typographic quotes and ligatures that OCR engines emit, folded to ASCII
+_ASCII_FOLD = str.maketrans({
+    '\u2018': "'", '\u2019': "'", '\u201c': '"', '\u201d': '"',
+    '\ufb02': "fl", '\ufb01': "fi",
+})
+
+# One box per line: "<class_id> <x> <y> <width> <height> [...] [#<ocr text>]"
+_BOX_LINE = re.compile(
+    r'^[ \t]*([+-]?\d+)[ \t]+([^\s#]+)[ \t]+([^\s#]+)[ \t]+([^\s#]+)[ \t]+([^\s#]+)'
+    r'[^#\r\n]*(?:#(.*?))?\s*?$', re.M)
+
 
 class DATParser:
     @staticmethod
@@ -10,56 +26,32 @@ class DATParser:
         boxes = []
         try:
             with open(file_path, 'r', encoding='ascii') as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-
-                    parts = line.split(' ', 1)
-                    if len(parts) < 2:
-                        parts = line.split('\t', 1)
-
-                    if len(parts) >= 2:
-                        class_id = int(parts[0])
-                        coords_text = parts[1]
-
-                        ocr_text = ""
-                        if '#' in coords_text:
-                            coord_part, ocr_text = coords_text.split('#', 1)
-                        else:
-                            coord_part = coords_text
-
-                        coords = coord_part.strip().split()
-                        if len(coords) >= 4:
-                            try:
-                                x = int(float(coords[0]))
-                                y = int(float(coords[1]))
-                                width = int(float(coords[2]))
-                                height = int(float(coords[3]))
-                                boxes.append(BoundingBox(
-                                    x, y, width, height, class_id, ocr_text))
-                            except (ValueError, IndexError) as e:
-                                print(f"Skipping invalid coordinate line: {coord_part.strip()}")
-                                continue
+                content = f.read()
         except Exception as e:
-            print(f"Parse error: {e}")
+            log.error("Parse error: %s", e)
+            return boxes
+
+        # Match every box line in one pass over the file; lines that don't
+        # match (blank, too few coordinates) are skipped as before
+        for class_id, x, y, width, height, ocr_text in _BOX_LINE.findall(content):
+            try:
+                boxes.append(BoundingBox(
+                    int(float(x)), int(float(y)), int(float(width)), int(float(height)),
+                    int(class_id), ocr_text))
+            except (ValueError, OverflowError):
+                log.debug("Skipping invalid coordinate line: %s %s %s %s", x, y, width, height)
 
         return boxes
 
     @staticmethod
     def save_dat_file(file_path: str, boxes: List[BoundingBox]):
         try:
+            content = '\r\n'.join([
+                f"{box.class_id} {int(box.x)} {int(box.y)} {int(box.width)} {int(box.height)} #{box.ocr_text}"
+                for box in sorted(boxes, key=attrgetter('class_id'))])
+            # Fold once over the whole file rather than per box
+            content = content.translate(_ASCII_FOLD).encode('ascii', 'ignore')
             with open(file_path, 'wb') as f:
-                lines = []
-                for box in sorted(boxes, key=lambda b: b.class_id):
-                    ocr_text = box.ocr_text
-                    ocr_text = ocr_text.replace('\u2018', "'").replace('\u2019', "'").replace('\u201c', '"').replace('\u201d', '"').replace('\ufb02', "fl").replace('\ufb01', "fi")
-                    ocr_text = ocr_text.encode(
-                        'ascii', 'ignore').decode('ascii')
-
-                    line = f"{box.class_id} {int(box.x)} {int(box.y)} {int(box.width)} {int(box.height)} #{ocr_text}"
-                    lines.append(line)
-                content = '\r\n'.join(lines)
-                f.write(content.encode('ascii'))
+                f.write(content)
         except Exception as e:
-            print(f"Save error: {e}")
+            log.error("Save error: %s", e)
@@ -4,6 +4,38 @@ import re
 from typing import Dict, Any, Optional
 from enum import Enum
 
+# MRZ cleanup: drop whitespace, keep only MRZ characters, then fix the
+# letters OCR commonly reads in place of digits
+_MRZ_WHITESPACE = re.compile(r'\s+')
+_MRZ_INVALID = re.compile(r'[^A-Z0-9<]')
+_MRZ_CORRECTIONS = str.maketrans({
+    'O': '0',  # Common mistake: letter O instead of zero
+    'I': '1',  # Common mistake: letter I instead of one
+    'S': '5',  # Common mistake: letter S instead of five
+    'Z': '2',  # Common mistake: letter Z instead of two
+    'B': '8',  # Common mistake: letter B instead of eight
+    'G': '6',  # Common mistake: letter G instead of six
+})
+
+# OpenCV and NumPy are imported on first use rather than at module scope:
+# this module is imported at startup, long before any preprocessing runs
+_cv2 = None
+_np = None
+
+
+def _require_cv2():
+    """Return (cv2, numpy), importing them once on first call"""
+    global _cv2, _np
+    if _cv2 is None:
+        try:
+            import cv2
+            import numpy as np
+        except ImportError:
+            raise ImportError("OpenCV and NumPy are required for image preprocessing")
+        _np = np
+        _cv2 = cv2
+    return _cv2, _np
+
 
 class CharacterPolicy(Enum):
     """Character preservation policies for universal language support"""
@@ -17,25 +49,40 @@ class CharacterPolicy(Enum):
 class ImageOperations:
     """Handles image processing operations for OCR and label processing"""
     
+    # (class_config, {class id: class entry}) for the last config looked up;
+    # replaced as one tuple so OCR threads never see a half-built index
+    _class_index = (None, {})
+    
+    @staticmethod
+    def _find_class(class_id: int, class_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Get the class entry for class_id, or None if it is not configured"""
+        config, by_id = ImageOperations._class_index
+        if config is not class_config:
+            by_id = {}
+            for cls in class_config["classes"]:
+                by_id.setdefault(cls["id"], cls)
+            ImageOperations._class_index = (class_config, by_id)
+        return by_id.get(class_id)
+    
     @staticmethod
     def _get_character_policy_for_class(class_id: int, class_config: Dict[str, Any]) -> CharacterPolicy:
         """Get character policy for a specific class with backwards compatibility"""
-        for cls in class_config["classes"]:
-            if cls["id"] == class_id:
-                # Check for explicit character policy (new system)
-                policy_str = cls.get("character_policy")
-                if policy_str:
-                    try:
-                        return CharacterPolicy(policy_str)
-                    except ValueError:
-                        pass  # Fall through to field type mapping
-                
-                # Backwards compatibility: map field types to policies
-                field_type = cls.get("field_type", "text")
-                return ImageOperations._map_field_type_to_policy(field_type)
+        cls = ImageOperations._find_class(class_id, class_config)
+        if cls is None:
+            # Default policy for unknown classes
+            return CharacterPolicy.UNICODE_PRESERVE
         
-        # Default policy for unknown classes
-        return CharacterPolicy.UNICODE_PRESERVE
+        # Check for explicit character policy (new system)
+        policy_str = cls.get("character_policy")
+        if policy_str:
+            try:
+                return CharacterPolicy(policy_str)
+            except ValueError:
+                pass  # Fall through to field type mapping
+        
+        # Backwards compatibility: map field types to policies
+        field_type = cls.get("field_type", "text")
+        return ImageOperations._map_field_type_to_policy(field_type)
     
     @staticmethod
     def _map_field_type_to_policy(field_type: str) -> CharacterPolicy:
@@ -111,14 +158,12 @@ class ImageOperations:
     @staticmethod
     def preprocess_image_by_field_type(image, class_id: int, class_config: Dict[str, Any]):
         """Preprocess image based on field type for optimal OCR results"""
-        field_type = None
-        for cls in class_config["classes"]:
-            if cls["id"] == class_id:
-                field_type = cls.get("field_type", "text")
-                break
+        cls = ImageOperations._find_class(class_id, class_config)
+        field_type = cls.get("field_type", "text") if cls else None
 
         if field_type == "mrz":
-            return ImageOperations._preprocess_mrz_image(image)
+            return ImageOperations._preprocess_mrz_image(
+                image, cls.get("scale_factor", 4), cls.get("interpolation", "lanczos"))
         elif field_type == "single_char":
             return ImageOperations._preprocess_single_char_image(image)
         else:
@@ -127,12 +172,9 @@ class ImageOperations:
     @staticmethod
     def _preprocess_single_char_image(image):
         """Preprocess image for single character recognition"""
-        try:
-            import cv2
-        except ImportError:
-            raise ImportError("OpenCV is required for image preprocessing")
+        cv2, _ = _require_cv2()
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         _, thresh = cv2.threshold(gray, 127, 255, cv2.THRESH_BINARY)
 
         scale_factor = 5
@@ -147,12 +189,9 @@ class ImageOperations:
     @staticmethod
     def _preprocess_general_image(image):
         """Preprocess image for general text recognition"""
-        try:
-            import cv2
-        except ImportError:
-            raise ImportError("OpenCV is required for image preprocessing")
+        cv2, _ = _require_cv2()
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         thresh = cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
                                       cv2.THRESH_BINARY, 11, 2)
 
@@ -166,15 +205,16 @@ class ImageOperations:
         return scaled
 
     @staticmethod
-    def _preprocess_mrz_image(image):
-        """Preprocess image for MRZ (Machine Readable Zone) recognition"""
-        try:
-            import cv2
-            import numpy as np
-        except ImportError:
-            raise ImportError("OpenCV and NumPy are required for MRZ preprocessing")
+    def _preprocess_mrz_image(image, scale_factor: float = 4, interpolation: str = "lanczos"):
+        """Preprocess image for MRZ (Machine Readable Zone) recognition
+        
+        scale_factor and interpolation come from the class's optional
+        "scale_factor" and "interpolation" keys; "cubic" or "linear" at a
+        smaller scale trade some quality for much cheaper upscaling.
+        """
+        cv2, np = _require_cv2()
 
-        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        gray = image if image.ndim == 2 else cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
 
         # CLAHE (Contrast Limited Adaptive Histogram Equalization)
         clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
@@ -183,67 +223,73 @@ class ImageOperations:
         # Bilateral filter for noise reduction
         filtered = cv2.bilateralFilter(enhanced, 9, 75, 75)
 
-        # Otsu's thresholding
+        # Otsu's thresholding; this and the opening below work in place on
+        # the filtered buffer, which nothing else reads
         _, binary = cv2.threshold(
-            filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+            filtered, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU, dst=filtered)
 
         # Morphological operations to clean up
         kernel = np.ones((2, 2), np.uint8)
-        cleaned = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel)
+        cleaned = cv2.morphologyEx(binary, cv2.MORPH_OPEN, kernel, dst=binary)
 
         # Scale up for better OCR
-        scale_factor = 4
+        interpolation_flags = {
+            "lanczos": cv2.INTER_LANCZOS4,
+            "cubic": cv2.INTER_CUBIC,
+            "linear": cv2.INTER_LINEAR,
+        }
         height, width = cleaned.shape
         new_width = int(width * scale_factor)
         new_height = int(height * scale_factor)
         scaled = cv2.resize(cleaned, (new_width, new_height),
-                           interpolation=cv2.INTER_LANCZOS4)
+                           interpolation=interpolation_flags.get(interpolation, cv2.INTER_LANCZOS4))
 
         # Sharpen the image
         kernel_sharpen = np.array([[-1, -1, -1],
                                   [-1, 9, -1],
                                   [-1, -1, -1]])
-        sharpened = cv2.filter2D(scaled, -1, kernel_sharpen)
+        # The scaled image is the largest buffer here; sharpen it in place
+        sharpened = cv2.filter2D(scaled, -1, kernel_sharpen, dst=scaled)
 
         return sharpened
 
     @staticmethod
     def get_tesseract_config_for_class(class_id: int, class_config: Dict[str, Any]) -> str:
         """Get Tesseract configuration using universal character policies"""
-        for cls in class_config["classes"]:
-            if cls["id"] == class_id:
-                # Check for explicit Tesseract config override first
-                explicit_config = cls.get("tesseract_config")
-                if explicit_config:
-                    return explicit_config
-                
-                # Use character policy to determine appropriate config
-                policy = ImageOperations._get_character_policy_for_class(class_id, class_config)
-                
-                if policy in [CharacterPolicy.UNICODE_PRESERVE, CharacterPolicy.ALPHANUMERIC_UNICODE]:
-                    # No character whitelist - supports any Unicode language
-                    return "--oem 3 --psm 8"
-                elif policy == CharacterPolicy.ASCII_ONLY:
-                    # ASCII whitelist for controlled fields (MRZ, codes, etc.)
-                    filter_rules = cls.get("char_filter_rules", {})
-                    allowed_punct = filter_rules.get("allow_punctuation", "<>")
-                    whitelist = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" + allowed_punct
-                    return f"--oem 3 --psm 8 -c tessedit_char_whitelist={whitelist}"
-                elif policy == CharacterPolicy.NUMERIC_ONLY:
-                    # Numeric whitelist
-                    filter_rules = cls.get("char_filter_rules", {})
-                    allowed_punct = filter_rules.get("allow_punctuation", "./-")
-                    whitelist = "0123456789" + allowed_punct
-                    return f"--oem 3 --psm 8 -c tessedit_char_whitelist={whitelist}"
-                elif policy == CharacterPolicy.CUSTOM:
-                    # Custom whitelist from filter rules
-                    filter_rules = cls.get("char_filter_rules", {})
-                    custom_whitelist = filter_rules.get("custom_whitelist", "")
-                    if custom_whitelist:
-                        return f"--oem 3 --psm 8 -c tessedit_char_whitelist={custom_whitelist}"
-                    else:
-                        return "--oem 3 --psm 8"  # Fallback to no whitelist
-        
+        cls = ImageOperations._find_class(class_id, class_config)
+        if cls is not None:
+            # Check for explicit Tesseract config override first
+            explicit_config = cls.get("tesseract_config")
+            if explicit_config:
+                return explicit_config
+            
+            # Use character policy to determine appropriate config
+            policy = ImageOperations._get_character_policy_for_class(class_id, class_config)
+            
+            if policy in [CharacterPolicy.UNICODE_PRESERVE, CharacterPolicy.ALPHANUMERIC_UNICODE]:
+                # No character whitelist - supports any Unicode language
+                return "--oem 3 --psm 8"
+            elif policy == CharacterPolicy.ASCII_ONLY:
+                # ASCII whitelist for controlled fields (MRZ, codes, etc.)
+                filter_rules = cls.get("char_filter_rules", {})
+                allowed_punct = filter_rules.get("allow_punctuation", "<>")
+                whitelist = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789" + allowed_punct
+                return f"--oem 3 --psm 8 -c tessedit_char_whitelist={whitelist}"
+            elif policy == CharacterPolicy.NUMERIC_ONLY:
+                # Numeric whitelist
+                filter_rules = cls.get("char_filter_rules", {})
+                allowed_punct = filter_rules.get("allow_punctuation", "./-")
+                whitelist = "0123456789" + allowed_punct
+                return f"--oem 3 --psm 8 -c tessedit_char_whitelist={whitelist}"
+            elif policy == CharacterPolicy.CUSTOM:
+                # Custom whitelist from filter rules
+                filter_rules = cls.get("char_filter_rules", {})
+                custom_whitelist = filter_rules.get("custom_whitelist", "")
+                if custom_whitelist:
+                    return f"--oem 3 --psm 8 -c tessedit_char_whitelist={custom_whitelist}"
+                else:
+                    return "--oem 3 --psm 8"  # Fallback to no whitelist
+            
         # Default config - supports Unicode for universal language support
         return "--oem 3 --psm 8"
 
@@ -253,18 +299,13 @@ class ImageOperations:
         # Get class configuration and regex pattern
         regex_pattern = None
         filter_rules = None
-        for cls in class_config["classes"]:
-            if cls["id"] == class_id:
-                regex_pattern = cls.get("regex_pattern", None)
-                filter_rules = cls.get("char_filter_rules", {})
-                break
-
         # Legacy handling for special field types that need custom processing
         field_type = None
-        for cls in class_config["classes"]:
-            if cls["id"] == class_id:
-                field_type = cls.get("field_type", "text")
-                break
+        cls = ImageOperations._find_class(class_id, class_config)
+        if cls is not None:
+            regex_pattern = cls.get("regex_pattern", None)
+            filter_rules = cls.get("char_filter_rules", {})
+            field_type = cls.get("field_type", "text")
         
         # Special cases that bypass normal policy processing
         if field_type == "mrz":
@@ -291,26 +332,8 @@ class ImageOperations:
     @staticmethod
     def _postprocess_mrz_text(text: str) -> str:
         """Post-process MRZ text"""
-        # Remove all whitespace
-        text = re.sub(r'\s+', '', text)
-        
-        # Keep only valid MRZ characters
-        text = re.sub(r'[^A-Z0-9<]', '', text)
-        
-        # Common OCR corrections for MRZ
-        corrections = {
-            'O': '0',  # Common mistake: letter O instead of zero
-            'I': '1',  # Common mistake: letter I instead of one
-            'S': '5',  # Common mistake: letter S instead of five
-            'Z': '2',  # Common mistake: letter Z instead of two
-            'B': '8',  # Common mistake: letter B instead of eight
-            'G': '6',  # Common mistake: letter G instead of six
-        }
-        
-        for wrong, correct in corrections.items():
-            text = text.replace(wrong, correct)
-        
-        return text
+        text = _MRZ_INVALID.sub('', _MRZ_WHITESPACE.sub('', text))
+        return text.translate(_MRZ_CORRECTIONS)
 
     @staticmethod
     def _postprocess_date_text(text: str) -> str:
@@ -8,6 +8,30 @@ from pathlib import Path
 from typing import Dict, Any, Optional, List, Union
 from copy import deepcopy
 
+try:
+    import orjson  # optional: faster settings load/save
+except ImportError:
+    orjson = None
+
+
+def _read_json(path: Path) -> Any:
+    """Load a JSON file, with orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_json(path: Path, data: Any):
+    """Write data as indented JSON in one write, with orjson when it is installed"""
+    if orjson is not None:
+        content = orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        content = json.dumps(data, indent=2).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(content)
+
 
 class SettingsManager:
     """Manages application settings with profile support and modular configuration"""
@@ -43,8 +67,7 @@ class SettingsManager:
         """Load base settings that all profiles inherit from"""
         if self.base_settings_file.exists():
             try:
-                with open(self.base_settings_file, 'r') as f:
-                    self.base_settings = json.load(f)
+                self.base_settings = _read_json(self.base_settings_file)
             except Exception as e:
                 print(f"Error loading base settings: {e}")
                 self.base_settings = self._get_default_base_settings()
@@ -55,8 +78,7 @@ class SettingsManager:
     def _save_base_settings(self):
         """Save base settings to file"""
         try:
-            with open(self.base_settings_file, 'w') as f:
-                json.dump(self.base_settings, f, indent=2)
+            _write_json(self.base_settings_file, self.base_settings)
         except Exception as e:
             print(f"Error saving base settings: {e}")
     
@@ -79,7 +101,9 @@ class SettingsManager:
             "performance": {
                 "max_workers": 10,
                 "cache_size_mb": 100,
-                "enable_threading": True
+                "enable_threading": True,
+                "ocr_use_processes": False,
+                "vietocr_int8": False
             },
             "file_types": {
                 "image_extensions": [".jpg", ".jpeg", ".png", ".bmp"],
@@ -104,8 +128,7 @@ class SettingsManager:
             return False
         
         try:
-            with open(profile_file, 'r') as f:
-                profile_settings = json.load(f)
+            profile_settings = _read_json(profile_file)
             
             # Merge with base settings (profile overrides base)
             self.settings = self._deep_merge(
@@ -140,8 +163,7 @@ class SettingsManager:
             # Only save differences from base settings
             profile_settings = self._get_differences(self.base_settings, settings)
             
-            with open(profile_file, 'w') as f:
-                json.dump(profile_settings, f, indent=2)
+            _write_json(profile_file, profile_settings)
             
             return True
             
@@ -171,8 +193,7 @@ class SettingsManager:
             base_file = self.profiles_dir / f"{base_on}.json"
             if base_file.exists():
                 try:
-                    with open(base_file, 'r') as f:
-                        settings = json.load(f)
+                    settings = _read_json(base_file)
                     return self.save_profile(profile_name, settings)
                 except Exception:
                     pass
@@ -285,8 +306,7 @@ class SettingsManager:
         
         try:
             export_path = Path(export_path)
-            with open(profile_file, 'r') as f:
-                settings = json.load(f)
+            settings = _read_json(profile_file)
             
             # Include metadata
             export_data = {
@@ -298,8 +318,7 @@ class SettingsManager:
                 "settings": settings
             }
             
-            with open(export_path, 'w') as f:
-                json.dump(export_data, f, indent=2)
+            _write_json(export_path, export_data)
             
             return True
             
@@ -311,8 +330,7 @@ class SettingsManager:
         try:
             import_path = Path(import_path)
             
-            with open(import_path, 'r') as f:
-                data = json.load(f)
+            data = _read_json(import_path)
             
             # Handle both direct settings and exported format
             if "settings" in data and "metadata" in data:
@@ -372,8 +390,7 @@ class SettingsManager:
             if not old_path.exists():
                 return False
             
-            with open(old_path, 'r') as f:
-                old_settings = json.load(f)
+            old_settings = _read_json(old_path)
             
             # Create default profile with old settings
             profile_settings = {
@@ -20,23 +20,24 @@ class ValidationEngine:
         
         for file_path in image_files:
             if file_path.is_file() and file_path.suffix.lower() in image_extensions:
-                dat_path = file_path.with_suffix('.dat')
-                
-                if dat_path.exists():
-                    validation_result = self.validate_dat_file(str(dat_path))
-                    validation_cache[str(file_path)] = validation_result
-                else:
-                    validation_result = {
-                        'valid': False,
-                        'no_dat': True,
-                        'missing_classes': False,
-                        'regex_errors': False,
-                        'box_count': 0
-                    }
-                    validation_cache[str(file_path)] = validation_result
+                validation_cache[str(file_path)] = self.validate_file(file_path)
         
         return validation_cache
     
+    def validate_file(self, file_path: Path) -> Dict[str, Any]:
+        """Validate the DAT file that belongs to one image"""
+        dat_path = file_path.with_suffix('.dat')
+        
+        if dat_path.exists():
+            return self.validate_dat_file(str(dat_path))
+        return {
+            'valid': False,
+            'no_dat': True,
+            'missing_classes': False,
+            'regex_errors': False,
+            'box_count': 0
+        }
+    
     def validate_dat_file(self, dat_path: str) -> Dict[str, Any]:
         """Validate a single DAT file"""
         try:
@@ -140,7 +141,11 @@ class ValidationEngine:
     
     def get_file_validation_status(self, file_path: str) -> str:
         """Get validation status string for file"""
-        validation = self.validation_cache.get(file_path)
+        return self.status_for(self.validation_cache.get(file_path))
+    
+    @staticmethod
+    def status_for(validation: Dict[str, Any]) -> str:
+        """Get validation status string for a validation_cache entry (or None)"""
         if not validation:
             return "normal"
         
@@ -29,6 +29,7 @@ class ImageCanvas(Gtk.DrawingArea):
         self.pixbuf = None
         self.boxes = []
         self.selected_box = None
+        self._selected_idx = -1  # Position hint for selected_box in boxes
         self.scale_factor = 1.0
         self.base_scale_factor = 1.0  # For fit-to-window
         self.zoom_level = 1.0  # User zoom multiplier
@@ -471,11 +472,22 @@ class ImageCanvas(Gtk.DrawingArea):
         elif self.creating_box:
             self.queue_draw()
 
+    def _selected_index(self) -> int:
+        """Index of the selected box, re-validated since the list is shared"""
+        idx = self._selected_idx
+        if 0 <= idx < len(self.boxes) and self.boxes[idx] is self.selected_box:
+            return idx
+        idx = next((i for i, b in enumerate(self.boxes) if b is self.selected_box), -1)
+        self._selected_idx = idx
+        return idx
+
     def on_key_pressed(self, controller, keyval, keycode, state):
         ctrl_pressed = (state & Gdk.ModifierType.CONTROL_MASK) != 0
 
         if keyval == Gdk.KEY_Delete and self.selected_box:
-            self.boxes.remove(self.selected_box)
+            idx = self._selected_index()
+            if idx >= 0:
+                del self.boxes[idx]
             self.selected_box = None
             if self.on_box_selected:
                 self.on_box_selected(None)
@@ -494,19 +506,14 @@ class ImageCanvas(Gtk.DrawingArea):
             return True
         elif keyval == Gdk.KEY_Tab:
             if self.boxes:
-                current_idx = -1
-                if self.selected_box:
-                    try:
-                        current_idx = self.boxes.index(self.selected_box)
-                    except ValueError:
-                        pass
-
+                current_idx = self._selected_index() if self.selected_box else -1
                 next_idx = (current_idx + 1) % len(self.boxes)
                 if self.selected_box:
                     self.selected_box.selected = False
 
                 self.selected_box = self.boxes[next_idx]
                 self.selected_box.selected = True
+                self._selected_idx = next_idx
 
                 if self.on_box_selected:
                     self.on_box_selected(self.selected_box)
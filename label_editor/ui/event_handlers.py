@@ -1,5 +1,7 @@
 #!/usr/bin/env python3
 
+import logging
+
 import gi
 gi.require_version('Gtk', '4.0')
 gi.require_version('Gdk', '4.0')
@@ -10,6 +12,8 @@ from ..business.label_logic import LabelManager, OCRProcessor
 from ..business.project_state import ProjectManager
 from ..core.keymap import KeymapManager
 
+log = logging.getLogger(__name__)
+
 
 class EventHandlerMixin:
     """Mixin class containing all event handlers for LabelEditorWindow"""
@@ -20,8 +24,8 @@ class EventHandlerMixin:
         try:
             self.keymap_manager = KeymapManager()
         except Exception as e:
-            print(f"Error initializing keymap: {e}")
-            print("Please ensure keymap.json exists in the settings directory")
+            log.error("Error initializing keymap: %s", e)
+            log.error("Please ensure keymap.json exists in the settings directory")
             raise
         
         # Setup global key bindings
@@ -180,7 +184,7 @@ class EventHandlerMixin:
                     is_confirmed = self.confirmation_manager.get_confirmation(file_path)
                 
                 # Debug: print binding info
-                print(f"Binding item {position}: {filename} - validation: {validation_status}, confirmed: {is_confirmed}")
+                log.debug("Binding item %s: %s - validation: %s, confirmed: %s", position, filename, validation_status, is_confirmed)
                 
                 # Remove existing style classes
                 label.remove_css_class('file-normal')
@@ -254,7 +258,7 @@ class EventHandlerMixin:
             try:
                 self.save_dat_file(str(self.project_manager.current_dat_path))
             except Exception as e:
-                print(f"Auto-save failed: {e}")
+                log.warning("Auto-save failed: %s", e)
     
     # Menu action handlers
     def on_open_directory(self, action, param):
@@ -431,42 +435,129 @@ class EventHandlerMixin:
     
     def on_ocr_clicked(self, button):
         """Handle OCR button click"""
-        print("[OCR] on_ocr_clicked called")
+        log.debug("on_ocr_clicked called")
         
         if (not hasattr(self, 'canvas') or not self.canvas.selected_box or 
             not hasattr(self, 'project_manager') or not self.project_manager.current_image_path):
-            print("[OCR] Validation failed - missing canvas, selected_box, or current_image_path")
+            log.debug("Validation failed - missing canvas, selected_box, or current_image_path")
             self.show_error("Please select a label first")
             return
         
-        print(f"[OCR] Selected box: {self.canvas.selected_box}")
-        print(f"[OCR] Current image: {self.project_manager.current_image_path}")
+        log.debug("Selected box: %s", self.canvas.selected_box)
+        log.debug("Current image: %s", self.project_manager.current_image_path)
         
         button.set_label("⏳ Processing...")
         button.set_sensitive(False)
         
-        # Setup OCR processor
+        log.debug("Starting OCR processing...")
+        ocr_engine = self._selected_ocr_engine()
+        self._get_ocr_processor().process_ocr(
+            self.project_manager.current_image_path, 
+            self.canvas.selected_box,
+            ocr_engine
+        )
+        log.debug("OCR processing started")
+    
+    def on_ocr_all_clicked(self, button):
+        """Handle OCR all labels button click: OCR every box of the image in one batch"""
+        if (not hasattr(self, 'canvas') or not self.canvas.boxes or
+            not hasattr(self, 'project_manager') or not self.project_manager.current_image_path):
+            self.show_error("There are no labels to run OCR on")
+            return
+        
+        button.set_label("⏳ Processing...")
+        button.set_sensitive(False)
+        
+        image_path = self.project_manager.current_image_path
+        boxes = list(self.canvas.boxes)
+        results = []
+        errors = []
+        
+        # Callbacks run on OCR threads; list.append is safe there, and the
+        # results are applied on the main thread once the batch is done
+        self._get_ocr_processor().process_ocr_batch(
+            image_path, boxes, self._selected_ocr_engine(),
+            callback=lambda box, text: results.append((box, text)),
+            on_error=errors.append,
+            on_done=lambda: GLib.idle_add(
+                self._ocr_all_complete, button, image_path, len(boxes), results, errors))
+    
+    def _ocr_all_complete(self, button, image_path, box_count, results, errors):
+        """Apply the texts from an OCR all labels batch on the main thread"""
+        button.set_label("🔍 OCR All Labels")
+        button.set_sensitive(True)
+        
+        if self.project_manager.current_image_path != image_path:
+            log.debug("Image changed during OCR batch, discarding results")
+            return False
+        if errors:
+            # One cause (e.g. a missing library) usually fails every box
+            self.show_error("\n".join(dict.fromkeys(errors)))
+        
+        results = [(box, text) for box, text in results
+                   if text.strip() and text != box.ocr_text]
+        if not results:
+            if not errors:
+                self.show_info("No new text detected in the labels")
+            return False
+        
+        def apply(replace_existing):
+            updated = 0
+            for box, text in results:
+                if replace_existing or not box.ocr_text:
+                    box.ocr_text = text
+                    updated += 1
+            if updated:
+                self.on_boxes_changed()
+                self.on_box_selected(self.canvas.selected_box)
+                self.canvas.queue_draw()
+            self.update_status(f"OCR filled {updated} of {box_count} labels")
+        
+        existing = sum(1 for box, _ in results if box.ocr_text)
+        if not existing:
+            apply(False)
+            return False
+        
+        dialog = Gtk.MessageDialog(
+            transient_for=self,
+            message_type=Gtk.MessageType.QUESTION,
+            buttons=Gtk.ButtonsType.YES_NO,
+            text="OCR Text Extracted"
+        )
+        dialog.set_property(
+            "secondary-text",
+            f"{existing} of the {len(results)} labels with new text already have text.\n\n"
+            "Replace their current text too? Labels without text are filled either way.")
+        
+        def on_response(d, response):
+            apply(response == Gtk.ResponseType.YES)
+            d.destroy()
+        
+        dialog.connect('response', on_response)
+        dialog.present()
+        return False  # Don't repeat this idle callback
+    
+    def _get_ocr_processor(self) -> OCRProcessor:
+        """Get the OCR processor, creating it on first use"""
         if not hasattr(self, 'ocr_processor'):
-            print("[OCR] Creating new OCRProcessor")
-            self.ocr_processor = OCRProcessor(self.project_manager.class_config)
+            log.debug("Creating new OCRProcessor")
+            settings = self.project_manager.settings_manager
+            self.ocr_processor = OCRProcessor(
+                self.project_manager.class_config,
+                use_processes=settings.get('performance.ocr_use_processes', False),
+                quantize_vietocr=settings.get('performance.vietocr_int8', False))
+            button = self.ocr_button
             self.ocr_processor.on_ocr_complete = lambda text, current: self._ocr_complete(button, text)
             self.ocr_processor.on_ocr_error = lambda error: self._ocr_error(button, error)
-        else:
-            print("[OCR] Using existing OCRProcessor")
-        
-        # Get selected OCR engine from dropdown
+        return self.ocr_processor
+    
+    def _selected_ocr_engine(self) -> str:
+        """Get the OCR engine chosen in the dropdown"""
         ocr_engine = "tesseract"  # Default
         if hasattr(self, 'ocr_model_combo'):
             ocr_engine = self.ocr_model_combo.get_active_id()
-            print(f"[OCR] Selected OCR engine: {ocr_engine}")
-        
-        print("[OCR] Starting OCR processing...")
-        self.ocr_processor.process_ocr(
-            self.project_manager.current_image_path, 
-            self.canvas.selected_box,
-            ocr_engine
-        )
-        print("[OCR] OCR processing started")
+            log.debug("Selected OCR engine: %s", ocr_engine)
+        return ocr_engine
     
     def on_confirm_toggled(self, checkbox):
         """Handle confirmation checkbox toggle"""
@@ -567,12 +658,12 @@ class EventHandlerMixin:
                 self.focus_ocr_textbox()
                 return True
             elif action == "editing.run_ocr":
-                print("[OCR] run_ocr action triggered from keyboard")
+                log.debug("run_ocr action triggered from keyboard")
                 if hasattr(self, 'ocr_button'):
-                    print("[OCR] Calling on_ocr_clicked")
+                    log.debug("Calling on_ocr_clicked")
                     self.on_ocr_clicked(self.ocr_button)
                 else:
-                    print("[OCR] No ocr_button found")
+                    log.debug("No ocr_button found")
                 return True
             elif action == "editing.quick_delete":
                 self.quick_delete_selected()
@@ -680,21 +771,28 @@ class EventHandlerMixin:
         self.auto_save_current()
         if hasattr(self, 'project_manager'):
             self.project_manager.save_config()
+            self.project_manager.close()
+        if hasattr(self, 'ocr_processor'):
+            self.ocr_processor.close()
+        if hasattr(self, 'label_manager'):
+            self.label_manager.close()
+        if hasattr(self, 'confirmation_manager'):
+            self.confirmation_manager.close()
         return False
     
     # Helper methods for OCR
     def _ocr_complete(self, button, extracted_text):
         """Handle OCR completion"""
-        print(f"[OCR] _ocr_complete called with text: '{extracted_text}'")
+        log.debug("_ocr_complete called with text: '%s'", extracted_text)
         
         def update_ui():
-            print("[OCR] Updating UI in main thread")
+            log.debug("Updating UI in main thread")
             try:
                 button.set_label("🔍 Run OCR")
                 button.set_sensitive(True)
                 
                 if not extracted_text.strip():
-                    print("[OCR] No text extracted, showing info dialog")
+                    log.debug("No text extracted, showing info dialog")
                     self.show_info("No text detected in the selected region")
                     return False
                 
@@ -702,7 +800,7 @@ class EventHandlerMixin:
                 if hasattr(self, 'canvas') and self.canvas.selected_box:
                     current_text = self.canvas.selected_box.ocr_text or ""
                 
-                print(f"[OCR] Creating dialog, current_text: '{current_text}'")
+                log.debug("Creating dialog, current_text: '%s'", current_text)
                 dialog = Gtk.MessageDialog(
                     transient_for=self,
                     message_type=Gtk.MessageType.QUESTION,
@@ -718,21 +816,19 @@ Replace current text with extracted text?"""
                 dialog.set_property("secondary-text", dialog_text)
                 
                 def on_response(d, response):
-                    print(f"[OCR] Dialog response: {response}")
+                    log.debug("Dialog response: %s", response)
                     if response == Gtk.ResponseType.YES and hasattr(self, 'ocr_text'):
                         buffer = self.ocr_text.get_buffer()
                         buffer.set_text(extracted_text, -1)
-                        print("[OCR] Text updated in buffer")
+                        log.debug("Text updated in buffer")
                     d.destroy()
                 
                 dialog.connect('response', on_response)
                 dialog.present()
-                print("[OCR] Dialog presented")
+                log.debug("Dialog presented")
                 return False  # Don't repeat this idle callback
             except Exception as e:
-                print(f"[OCR] Error in UI update: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Error in UI update: %s", e)
                 return False
         
         # Use GLib.idle_add to marshal to main thread
@@ -740,20 +836,18 @@ Replace current text with extracted text?"""
     
     def _ocr_error(self, button, error_message):
         """Handle OCR error"""
-        print(f"[OCR] _ocr_error called with message: '{error_message}'")
+        log.debug("_ocr_error called with message: '%s'", error_message)
         
         def update_ui():
-            print("[OCR] Updating UI after error in main thread")
+            log.debug("Updating UI after error in main thread")
             try:
                 button.set_label("🔍 Run OCR")
                 button.set_sensitive(True)
                 self.show_error(error_message)
-                print("[OCR] Error dialog shown")
+                log.debug("Error dialog shown")
                 return False  # Don't repeat this idle callback
             except Exception as e:
-                print(f"[OCR] Error in error UI update: {e}")
-                import traceback
-                traceback.print_exc()
+                log.exception("Error in error UI update: %s", e)
                 return False
         
         # Use GLib.idle_add to marshal to main thread
@@ -776,6 +870,9 @@ Replace current text with extracted text?"""
             
             # Update class configuration and label manager
             self.project_manager.class_config = self.project_manager._parse_class_config()
+            # Commit the old manager's queued deletion history and stop its writer
+            if hasattr(self, 'label_manager'):
+                self.label_manager.close()
             self.label_manager = LabelManager(self.project_manager.class_config)
             
             # Update validation engine with new classes
@@ -814,6 +911,9 @@ Replace current text with extracted text?"""
     
     def _load_directory_and_refresh(self, directory_path):
         """Load directory and refresh all related UI components"""
+        if hasattr(self, 'ocr_processor'):
+            self.ocr_processor.clear_image_cache()
+        
         try:
             # Load the directory through project manager
             if hasattr(self.project_manager, 'load_directory'):
@@ -868,6 +968,9 @@ Replace current text with extracted text?"""
         self.project_manager.current_index = -1
         self.project_manager.current_image_path = None
         
+        if hasattr(self, 'ocr_processor'):
+            self.ocr_processor.clear_image_cache()
+        
         # Clear UI elements
         if hasattr(self, 'canvas'):
             self.canvas.clear_image()
@@ -566,6 +566,13 @@ class LabelEditorWindow(Gtk.ApplicationWindow, EventHandlerMixin):
         button_box.append(ocr_button)
         self.ocr_button = ocr_button
         
+        # OCR all labels button
+        ocr_all_button = Gtk.Button(label="🔍 OCR All Labels")
+        ocr_all_button.set_tooltip_text("Extract text for every label on this image in one batch")
+        ocr_all_button.connect('clicked', self.on_ocr_all_clicked)
+        button_box.append(ocr_all_button)
+        self.ocr_all_button = ocr_all_button
+        
         # OCR model selection dropdown
         ocr_model_box = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6)
         ocr_model_label = Gtk.Label(label="OCR Model:")